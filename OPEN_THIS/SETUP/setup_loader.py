@@ -8,7 +8,60 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+# Prefer orjson for parsing when available (falls back to the standard library)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Required configuration fields, expressed as JSON Schemas keyed by the error
+# reported when the schema does not match. Values must be present and truthy.
+_TRUTHY = {'not': {'enum': [None, '', 0, False, [], {}]}}
+_REQUIRED_FIELD_SCHEMAS = [
+    ('Missing MATLAB installation paths', {
+        'type': 'object',
+        'required': ['matlab'],
+        'properties': {
+            'matlab': {'type': 'object', 'required': ['installation_paths']}
+        }
+    }),
+    ('Missing server configuration', {
+        'type': 'object',
+        'required': ['server'],
+        'properties': {
+            'server': {
+                'type': 'object',
+                'required': ['host', 'port'],
+                'properties': {'host': _TRUTHY, 'port': _TRUTHY}
+            }
+        }
+    }),
+    ('Missing Python executable configuration', {
+        'type': 'object',
+        'required': ['python'],
+        'properties': {
+            'python': {
+                'type': 'object',
+                'required': ['executable'],
+                'properties': {'executable': _TRUTHY}
+            }
+        }
+    }),
+]
+
+# Compile the schemas with jsonschema-rs when available; validate() falls back
+# to equivalent hand-written checks otherwise
+try:
+    import jsonschema_rs
+    _compile_schema = getattr(jsonschema_rs, 'validator_for', None) or jsonschema_rs.JSONSchema
+    _REQUIRED_FIELD_VALIDATORS = [
+        (message, _compile_schema(schema)) for message, schema in _REQUIRED_FIELD_SCHEMAS
+    ]
+except ImportError:
+    _REQUIRED_FIELD_VALIDATORS = None
 
 
 class SetupConfigLoader:
@@ -29,6 +82,12 @@ class SetupConfigLoader:
         self.config_path = Path(config_path)
         self.config: Optional[Dict[str, Any]] = None
         self.loaded = False
+        self._valid_matlab_path: Optional[str] = None
+        # (config file mtime, result) of the last successful validate() call
+        self._validation_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        # Values built by the get_* helpers, reset (with _valid_matlab_path)
+        # whenever the file is (re)loaded
+        self._getter_cache: Dict[str, Any] = {}
     
     def load(self) -> Dict[str, Any]:
         """
@@ -40,12 +99,14 @@ class SetupConfigLoader:
         if self.loaded and self.config:
             return self.config
         
+        self._getter_cache = {}
+        self._valid_matlab_path = None
+        
         try:
             if not self.config_path.exists():
                 raise FileNotFoundError(f'Configuration file not found: {self.config_path}')
             
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            self.config = _json_loads(self.config_path.read_bytes())
             
             # Sync simplified top-level fields to internal config structure
             if 'YOUR_IP_ADDRESS' in self.config:
@@ -71,16 +132,23 @@ class SetupConfigLoader:
     
     def get_matlab_paths(self) -> List[str]:
         """Get MATLAB installation paths"""
-        config = self.load()
-        return config.get('matlab', {}).get('installation_paths', [])
+        if 'matlab_paths' not in self._getter_cache:
+            config = self.load()
+            self._getter_cache['matlab_paths'] = config.get('matlab', {}).get('installation_paths', [])
+        return self._getter_cache['matlab_paths']
     
     def get_python_executable(self) -> str:
         """Get Python executable path"""
-        config = self.load()
-        return config.get('python', {}).get('executable', 'python')
+        if 'python_executable' not in self._getter_cache:
+            config = self.load()
+            self._getter_cache['python_executable'] = config.get('python', {}).get('executable', 'python')
+        return self._getter_cache['python_executable']
     
     def get_server_config(self) -> Dict[str, Any]:
         """Get server configuration"""
+        if 'server_config' in self._getter_cache:
+            return self._getter_cache['server_config']
+        
         config = self.load()
         server = config.get('server', {})
         host = server.get('host')
@@ -89,7 +157,7 @@ class SetupConfigLoader:
         if not host:
             raise ValueError('Server host not configured in setup_variable.json. Please set server.host to your PC\'s IP address.')
         
-        return {
+        self._getter_cache['server_config'] = {
             'host': host,
             'port': port,
             'url': f'http://{host}:{port}',
@@ -99,21 +167,27 @@ class SetupConfigLoader:
                 'url': f'ws://{host}:{port}{server.get("websocket", {}).get("path", "/ws")}'
             }
         }
+        return self._getter_cache['server_config']
     
     def get_hfss_config(self) -> Dict[str, Any]:
         """Get HFSS configuration"""
-        config = self.load()
-        return config.get('hfss', {})
+        if 'hfss_config' not in self._getter_cache:
+            config = self.load()
+            self._getter_cache['hfss_config'] = config.get('hfss', {})
+        return self._getter_cache['hfss_config']
     
     def get_project_paths(self) -> Dict[str, Path]:
         """Get project paths configuration"""
+        if 'project_paths' in self._getter_cache:
+            return self._getter_cache['project_paths']
+        
         config = self.load()
         paths = config.get('paths', {})
         
         # Get project root (usually current directory)
         project_root = Path.cwd()
         
-        return {
+        self._getter_cache['project_paths'] = {
             'project_root': project_root / paths.get('project_root', '.'),
             'uploads_dir': project_root / paths.get('uploads_dir', './uploads'),
             'gnd_files_dir': project_root / paths.get('gnd_files_dir', './uploads/gnd_files'),
@@ -121,16 +195,43 @@ class SetupConfigLoader:
             'scripts_dir': project_root / paths.get('scripts_dir', './scripts'),
             'test_files_dir': project_root / paths.get('test_files_dir', './test_files')
         }
+        return self._getter_cache['project_paths']
     
     def get_performance_settings(self) -> Dict[str, Any]:
         """Get performance settings"""
-        config = self.load()
-        return config.get('performance', {
-            'cache_ttl_ms': 1000,
-            'websocket_heartbeat_ms': 2000,
-            'status_polling_interval_ms': 3000,
-            'max_file_upload_mb': 50
-        })
+        if 'performance_settings' not in self._getter_cache:
+            config = self.load()
+            self._getter_cache['performance_settings'] = config.get('performance', {
+                'cache_ttl_ms': 1000,
+                'websocket_heartbeat_ms': 2000,
+                'status_polling_interval_ms': 3000,
+                'max_file_upload_mb': 50
+            })
+        return self._getter_cache['performance_settings']
+    
+    def _check_required_fields(self, config: Dict[str, Any]) -> List[str]:
+        """Check required fields without jsonschema-rs (same rules as _REQUIRED_FIELD_SCHEMAS)"""
+        errors = []
+        
+        if 'matlab' not in config or 'installation_paths' not in config.get('matlab', {}):
+            errors.append('Missing MATLAB installation paths')
+        
+        if 'server' not in config or not config.get('server', {}).get('host') or not config.get('server', {}).get('port'):
+            errors.append('Missing server configuration')
+        
+        if 'python' not in config or not config.get('python', {}).get('executable'):
+            errors.append('Missing Python executable configuration')
+        
+        return errors
+    
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a validation result so callers cannot change the cached one"""
+        return {
+            'valid': result['valid'],
+            'errors': list(result['errors']),
+            'warnings': list(result['warnings'])
+        }
     
     def validate(self) -> Dict[str, Any]:
         """
@@ -143,34 +244,53 @@ class SetupConfigLoader:
         warnings = []
         
         try:
+            # Reuse the previous result while setup_variable.json is unchanged
+            try:
+                mtime = self.config_path.stat().st_mtime
+            except OSError:
+                mtime = None  # load() below reports the missing file
+            if self._validation_cache:
+                if mtime is not None and self._validation_cache[0] == mtime:
+                    return self._copy_result(self._validation_cache[1])
+                # The file changed since the last validation - validate what is on disk now
+                self.loaded = False
+                self.config = None
+            
             config = self.load()
             
             # Check required fields
-            if 'matlab' not in config or 'installation_paths' not in config.get('matlab', {}):
-                errors.append('Missing MATLAB installation paths')
-            
-            if 'server' not in config or not config.get('server', {}).get('host') or not config.get('server', {}).get('port'):
-                errors.append('Missing server configuration')
+            if _REQUIRED_FIELD_VALIDATORS is not None:
+                errors.extend(
+                    message for message, validator in _REQUIRED_FIELD_VALIDATORS
+                    if not validator.is_valid(config)
+                )
+            else:
+                errors.extend(self._check_required_fields(config))
             
-            if 'python' not in config or not config.get('python', {}).get('executable'):
-                errors.append('Missing Python executable configuration')
-            
-            # Check if MATLAB exists
-            matlab_paths = self.get_matlab_paths()
+            # Check if MATLAB exists (reuse the path found by a previous validation
+            # while it is still configured)
             valid_matlab_path = None
-            for matlab_path in matlab_paths:
-                if Path(matlab_path).exists():
-                    valid_matlab_path = matlab_path
-                    break
+            if (self._valid_matlab_path and self._valid_matlab_path in self.get_matlab_paths()
+                    and Path(self._valid_matlab_path).exists()):
+                valid_matlab_path = self._valid_matlab_path
+            else:
+                for matlab_path in self.get_matlab_paths():
+                    if Path(matlab_path).exists():
+                        valid_matlab_path = matlab_path
+                        break
+                self._valid_matlab_path = valid_matlab_path
             
             if not valid_matlab_path:
                 warnings.append('MATLAB installation not found in configured paths')
             
-            return {
+            result = {
                 'valid': len(errors) == 0,
                 'errors': errors,
                 'warnings': warnings
             }
+            if mtime is not None:
+                self._validation_cache = (mtime, self._copy_result(result))
+            return result
         
         except Exception as e:
             return {
@@ -0,0 +1,45 @@
+"""
+Console Log
+Buffered console output shared by the generator scripts.
+
+Lines are queued and written to stdout in a single call when the script exits.
+-q / --quiet on the command line silences every line except those logged with
+always=True (usage, warnings and errors).
+"""
+
+import atexit
+import sys
+
+# Set UTF-8 encoding for console output (reconfigure the existing streams in
+# place, and only when they are not already UTF-8)
+if sys.platform == "win32":
+    for _stream in (sys.stdout, sys.stderr):
+        if (getattr(_stream, 'encoding', None) or '').lower() not in ('utf-8', 'utf8'):
+            _stream.reconfigure(encoding='utf-8')
+
+QUIET_FLAGS = ('-q', '--quiet')
+QUIET = any(arg in QUIET_FLAGS for arg in sys.argv[1:])
+
+_log_lines = []
+
+
+def log(message="", always=False):
+    """Queue a line of console output (dropped in quiet mode unless always is set)"""
+    if always or not QUIET:
+        _log_lines.append(str(message))
+
+
+def strip_quiet_flags(args):
+    """Return the command line arguments without the quiet flags"""
+    return [arg for arg in args if arg not in QUIET_FLAGS]
+
+
+def flush_log():
+    """Write all queued output lines to stdout at once"""
+    if _log_lines:
+        sys.stdout.write('\n'.join(_log_lines) + '\n')
+        _log_lines.clear()
+    sys.stdout.flush()
+
+
+atexit.register(flush_log)
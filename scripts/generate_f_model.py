@@ -15,49 +15,246 @@ REFACTORED: Now loads variable definitions from external JSON configuration file
 
 import sys
 import os
-import uuid
+import functools
+import pickle
+import stat
+import time
 from datetime import datetime
+from pathlib import Path
 
-# Set UTF-8 encoding for console output
-if sys.platform == "win32":
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+# Buffered console output; -q / --quiet prints only warnings and errors
+from console_log import log, strip_quiet_flags
 
 # Import variable configuration loader
-from variable_config_loader import VariableConfig
+from variable_config_loader import VariableConfig, DEFAULT_CONFIG_PATH
 
-# Generate unique execution ID for debugging
-EXECUTION_ID = str(uuid.uuid4())[:8]
+def _load_variable_defs_cached(config_path=DEFAULT_CONFIG_PATH):
+    """
+    Load variable definitions and metadata, reusing a pickled copy while the
+    JSON configuration file is unchanged (same mtime and size)
+    """
+    cache_path = Path(config_path).with_suffix('.cache.pkl')
+    source_key = None
+    
+    try:
+        config_stat = Path(config_path).stat()
+        source_key = (config_stat.st_mtime_ns, config_stat.st_size)
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('source') == source_key:
+            return cached['definitions'], cached['metadata']
+    except Exception:
+        pass  # Missing or unreadable cache - rebuild it below
+    
+    config = VariableConfig(config_path)
+    definitions = config.get_variable_definitions_dict()
+    metadata = config.get_metadata()
+    
+    if source_key is None:
+        return definitions, metadata
+    
+    # Write to a temporary file first so concurrent runs never read a partial cache
+    try:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'source': source_key, 'definitions': definitions, 'metadata': metadata},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        log(f"⚠️ Could not write variable definition cache: {e}", always=True)
+    
+    return definitions, metadata
 
-print(f"Script execution started - ID: {EXECUTION_ID}")
-print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-print(f"Arguments: {sys.argv}")
+@functools.lru_cache(maxsize=1)
+def _get_defs():
+    """Load (variable definitions, metadata) on first use"""
+    return _load_variable_defs_cached()
 
-# Load variable definitions from external configuration
-try:
-    config = VariableConfig()
-    VARIABLE_DEFINITIONS = config.get_variable_definitions_dict()
-    print(f"✅ Loaded {len(VARIABLE_DEFINITIONS)} variables from external configuration")
-    print(f"   Configuration version: {config.get_metadata().get('version', 'unknown')}")
-except Exception as e:
-    print(f"❌ Failed to load variable configuration: {e}")
-    sys.exit(1)
+# File header, formatted once per generated file
+_HEADER_TPL = """function F_Model_Element(fid, seed, Units)
+% Generated automatically by F_Model_Element Generator
+% Timestamp: {timestamp}
+% Selected variables: {total_opt_vars} out of 78 available (IDs may be non-sequential)
+%   - Standard variables: {standard_count}
+%   - Material variables: {material_count}
+% Ground plane parameters: {ground_plane_note}
+% Seed reassignment: 1 to {total_opt_vars}
+% Variable definitions loaded from: config/antenna_variables.json
+% Note: System uses ID-based lookup (robust to gaps in ID sequence)
 
-def generate_f_model_element(variable_ids):
-    """Generate F_Model_Element.m content with selected variables and seed reassignment"""
+global numVar;
+numVar = {total_opt_vars};
+Units = 'mm';
+
+"""
+_GND_NOTE = {True: "included (user configured)", False: "not included"}
+
+# MATLAB code templates. They are rendered in two stages: _precompile_variables()
+# fills in the per-variable fields once, leaving only the {seed} slot (written
+# here as {{seed}}) to be filled for every generated file.
+_MAPPING_STD_TPL = "% ID {id:2d} -> seed({{seed:2d}}) -> {name:15s} | Original: {formula}\n"
+_MAPPING_MAT_TPL = "% ID {id:2d} -> seed({{seed:2d}}) -> {material_name}.{property_name:10s} | Original: {formula}\n"
+
+_SPECIAL_VAR_TPL = (
+    "% Original: {formula}\n"
+    "{var_name} = {multiplier}*seed({{seed}}){offset:+g};\n"
+    "hfssChangeVar(fid,'{name}',{var_name},'{units}')\n\n"
+)
+_SPECIAL_VAR_ROUND_TPL = (
+    "% Original: {formula}\n"
+    "{var_name} = round({multiplier}*seed({{seed}}){offset:+g},{precision});\n"
+    "hfssChangeVar(fid,'{name}',{var_name},'{units}')\n\n"
+)
+
+_STD_VAR_TPL = (
+    "% Original: {formula}\n"
+    "Value{{seed}} = {multiplier}*seed({{seed}}){offset};\n"
+    "num{{seed}} = Value{{seed}};\n"
+    "hfssChangeVar(fid,'{name}',num{{seed}},'{units}');\n\n"
+)
+_STD_VAR_ROUND_TPL = (
+    "% Original: {formula}\n"
+    "Value{{seed}} = {multiplier}*seed({{seed}}){offset};\n"
+    "num{{seed}} = round(Value{{seed}}, {precision});\n"
+    "hfssChangeVar(fid,'{name}',num{{seed}},'{units}');\n\n"
+)
+
+_MATERIAL_VAR_TPL = (
+    "% Material Property: {name} - {description}\n"
+    "% Original: {formula}\n"
+    "{var_name} = {multiplier}*seed({{seed}}){offset};\n"
+)
+_MATERIAL_ROUND_TPL = "{var_name} = round({var_name}, {precision});\n"
+_MATERIAL_CHANGE_TPL = "hfssChangeMaterialProperty(fid, '{material_name}', '{property_name}', {var_name}, '{units}');\n\n"
+
+# Ground plane parameters (custom variables 83-86): id -> (MATLAB name, comment, default)
+# GND_xPos and GND_yPos represent the CENTER of the 25x25mm antenna
+_GND_IDS = frozenset((83, 84, 85, 86))
+_GND_META = {
+    83: ('Lgx', 'Ground plane length X', 25),
+    84: ('Lgy', 'Ground plane length Y', 25),
+    85: ('GND_xPos', 'Antenna X center position', 12.5),
+    86: ('GND_yPos', 'Antenna Y center position', 12.5),
+}
+_GND_VAR_TPL = (
+    "{name} = {default};  % {comment} (mm) - default/will be updated by UI\n"
+    "hfssChangeVar(fid,'{name}',{name},'mm');\n\n"
+)
+
+def _escape(value):
+    """Convert a definition value to text that survives the second str.format stage"""
+    return str(value).replace('{', '{{').replace('}', '}}')
+
+def _precompile_variables(definitions):
+    """
+    Build per-variable MATLAB snippets once per configuration load.
     
-    # Parse variable IDs
-    if isinstance(variable_ids, str):
-        if variable_ids.strip():
-            ids = [int(x.strip()) for x in variable_ids.split(',') if x.strip()]
+    Returns a dict: id -> {'kind': 'special'|'standard'|'material'|'custom',
+    'mapping': template, 'block': template}, where the templates only need the seed.
+    """
+    precompiled = {}
+    for vid, var_def in definitions.items():
+        if var_def.get('custom', False):
+            precompiled[vid] = {'kind': 'custom', 'mapping': None, 'block': None}
+            continue
+        
+        formula = _escape(var_def['formula'])
+        offset_str = _escape(f"{var_def['offset']:+g}" if var_def['offset'] != 0 else "")
+        
+        if var_def.get('category') == 'material':
+            # Variables without a var_name fall back to mat<seed>
+            var_name = _escape(var_def['var_name']) if 'var_name' in var_def else 'mat{seed}'
+            block = _MATERIAL_VAR_TPL.format(
+                name=_escape(var_def['name']),
+                description=_escape(var_def['description']),
+                formula=formula,
+                var_name=var_name,
+                multiplier=_escape(var_def['multiplier']),
+                offset=offset_str)
+            if var_def.get('precision') is not None:
+                block += _MATERIAL_ROUND_TPL.format(var_name=var_name, precision=_escape(var_def['precision']))
+            block += _MATERIAL_CHANGE_TPL.format(
+                material_name=_escape(var_def.get('material_name', 'unknown')),
+                property_name=_escape(var_def.get('material_property', 'permittivity')),
+                var_name=var_name,
+                units=_escape(var_def.get('units', '')))
+            precompiled[vid] = {
+                'kind': 'material',
+                'mapping': _MAPPING_MAT_TPL.format(
+                    id=vid,
+                    material_name=_escape(var_def.get('material_name', 'unknown')),
+                    property_name=_escape(var_def.get('material_property', 'unknown')),
+                    formula=formula),
+                'block': block
+            }
+            continue
+        
+        # Special variables (1-6) keep the old naming style; variable 6 (brown) has no rounding
+        if var_def.get('category') == 'special':
+            kind = 'special'
+            template = _SPECIAL_VAR_TPL if var_def.get('precision') is None else _SPECIAL_VAR_ROUND_TPL
+            offset = var_def['offset']
+            var_name = _escape(var_def['var_name']) if 'var_name' in var_def else 'var{seed}'
         else:
-            ids = []
-    else:
-        ids = list(variable_ids)
+            # Standard variables with modern naming
+            kind = 'standard'
+            template = _STD_VAR_TPL if var_def.get('precision') is None else _STD_VAR_ROUND_TPL
+            offset = offset_str
+            var_name = None
+        
+        precompiled[vid] = {
+            'kind': kind,
+            'mapping': _MAPPING_STD_TPL.format(id=vid, name=_escape(var_def['name']), formula=formula),
+            'block': template.format(
+                formula=formula,
+                var_name=var_name,
+                multiplier=_escape(var_def['multiplier']),
+                offset=offset,
+                precision=_escape(var_def.get('precision')),
+                name=_escape(var_def['name']),
+                units=_escape(var_def.get('units', 'mm')))
+        }
+    return precompiled
+
+@functools.lru_cache(maxsize=1)
+def _get_precompiled():
+    """Precompiled snippets for the loaded definitions, built on first use"""
+    return _precompile_variables(_get_defs()[0])
+
+def _partition_variable_ids(ids):
+    """Split variable IDs into (optimization, custom, material) lists in a single pass"""
+    precompiled = _get_precompiled()
+    optimization_ids, custom_ids, material_ids = [], [], []
+    for vid in ids:
+        kind = precompiled[vid]['kind']
+        if kind == 'custom':
+            custom_ids.append(vid)
+        elif kind == 'material':
+            material_ids.append(vid)
+        else:
+            optimization_ids.append(vid)
+    return optimization_ids, custom_ids, material_ids
+
+def _parse_ids(variable_ids_str):
+    """Parse a comma-separated variable ID string (e.g. '1,2,3') into a list of ints"""
+    return [int(x) for x in variable_ids_str.split(',') if x.strip()]
+
+def generate_f_model_element(variable_ids):
+    """
+    Generate F_Model_Element.m content with selected variables and seed reassignment
+    
+    Args:
+        variable_ids: List of already-parsed variable IDs
+    
+    Returns:
+        Tuple of (MATLAB content, (optimization_ids, custom_ids, material_ids))
+    """
+    ids = list(variable_ids)
+    definitions = _get_defs()[0]
+    precompiled = _get_precompiled()
     
     # Validate variable IDs using dictionary lookup (handles non-sequential IDs)
-    invalid_ids = [vid for vid in ids if vid not in VARIABLE_DEFINITIONS]
+    invalid_ids = [vid for vid in ids if vid not in definitions]
     if invalid_ids:
         raise ValueError(f"Invalid variable IDs: {invalid_ids}")
     
@@ -68,9 +265,7 @@ def generate_f_model_element(variable_ids):
     ids.sort()
     
     # Separate optimization variables from custom variables (ground plane) and material variables
-    optimization_ids = [vid for vid in ids if not VARIABLE_DEFINITIONS[vid].get('custom', False) and VARIABLE_DEFINITIONS[vid].get('category') != 'material']
-    custom_ids = [vid for vid in ids if VARIABLE_DEFINITIONS[vid].get('custom', False)]
-    material_ids = [vid for vid in ids if VARIABLE_DEFINITIONS[vid].get('category') == 'material']
+    optimization_ids, custom_ids, material_ids = _partition_variable_ids(ids)
     
     # Note: Ground plane variables (83-86) are NO LONGER automatically included
     # They will only be added if user explicitly selects/configures them via the UI
@@ -78,245 +273,181 @@ def generate_f_model_element(variable_ids):
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    has_ground_plane = any(vid in [83, 84, 85, 86] for vid in custom_ids)
-    has_material_vars = len(material_ids) > 0
-    ground_plane_note = "included (user configured)" if has_ground_plane else "not included"
-    material_note = f"included ({len(material_ids)} material properties)" if has_material_vars else "not included"
+    ground_plane_note = _GND_NOTE[not _GND_IDS.isdisjoint(custom_ids)]
     
     # Total optimizable variables includes both standard and material variables
     total_opt_vars = len(optimization_ids) + len(material_ids)
     
-    matlab_content = f"""function F_Model_Element(fid, seed, Units)
-% Generated automatically by F_Model_Element Generator
-% Timestamp: {timestamp}
-% Selected variables: {total_opt_vars} out of 78 available (IDs may be non-sequential)
-%   - Standard variables: {len(optimization_ids)}
-%   - Material variables: {len(material_ids)}
-% Ground plane parameters: {ground_plane_note}
-% Seed reassignment: 1 to {total_opt_vars}
-% Variable definitions loaded from: config/antenna_variables.json
-% Note: System uses ID-based lookup (robust to gaps in ID sequence)
-
-global numVar;
-numVar = {total_opt_vars};
-Units = 'mm';
-
-"""
+    parts = [_HEADER_TPL.format(
+        timestamp=timestamp,
+        total_opt_vars=total_opt_vars,
+        standard_count=len(optimization_ids),
+        material_count=len(material_ids),
+        ground_plane_note=ground_plane_note)]
     
     # Add comments showing variable mapping (including material variables)
-    matlab_content += f"% Variable mapping (ID -> Seed -> MATLAB Variable):\n"
+    parts.append("% Variable mapping (ID -> Seed -> MATLAB Variable):\n")
     current_seed = 1
     
-    # Map standard variables
-    for var_id in optimization_ids:
-        var_def = VARIABLE_DEFINITIONS[var_id]
-        matlab_content += f"% ID {var_id:2d} -> seed({current_seed:2d}) -> {var_def['name']:15s} | Original: {var_def['formula']}\n"
-        current_seed += 1
-    
-    # Map material variables
-    for var_id in material_ids:
-        var_def = VARIABLE_DEFINITIONS[var_id]
-        material_name = var_def.get('material_name', 'unknown')
-        property_name = var_def.get('material_property', 'unknown')
-        matlab_content += f"% ID {var_id:2d} -> seed({current_seed:2d}) -> {material_name}.{property_name:10s} | Original: {var_def['formula']}\n"
+    # Map standard variables, then material variables
+    for var_id in optimization_ids + material_ids:
+        parts.append(precompiled[var_id]['mapping'].format(seed=current_seed))
         current_seed += 1
     
-    matlab_content += "\n"
+    parts.append("\n")
     
-    # Generate variable assignments with seed reassignment (standard variables)
+    # Generate variable assignments with seed reassignment (standard variables,
+    # followed by material property assignments)
     current_seed = 1
-    for var_id in optimization_ids:
-        var_def = VARIABLE_DEFINITIONS[var_id]
-        
-        # Check if this is a special variable (category == 'special')
-        is_special = var_def.get('category') == 'special'
-        
-        # Handle special variables (1-6) with old naming style
-        if is_special:
-            # Add original formula as comment for special variables
-            matlab_content += f"% Original: {var_def['formula']}\n"
-            
-            # Get the custom variable name
-            var_name = var_def.get('var_name', f'var{current_seed}')
-            units = var_def.get('units', 'mm')
-            
-            if var_def.get('precision') is None:  # Variable 6 (brown) - no rounding
-                matlab_content += f"{var_name} = {var_def['multiplier']}*seed({current_seed}){var_def['offset']:+g};\n"
-            else:
-                matlab_content += f"{var_name} = round({var_def['multiplier']}*seed({current_seed}){var_def['offset']:+g},{var_def['precision']});\n"
-            
-            matlab_content += f"hfssChangeVar(fid,'{var_def['name']}',{var_name},'{units}')\n\n"
-        else:
-            # Standard variables with modern naming
-            # Add original formula as comment
-            matlab_content += f"% Original: {var_def['formula']}\n"
-            
-            # Generate new formula with reassigned seed
-            offset_str = f"{var_def['offset']:+g}" if var_def['offset'] != 0 else ""
-            matlab_content += f"Value{current_seed} = {var_def['multiplier']}*seed({current_seed}){offset_str};\n"
-            
-            if var_def.get('precision') is not None:
-                matlab_content += f"num{current_seed} = round(Value{current_seed}, {var_def['precision']});\n"
-            else:
-                matlab_content += f"num{current_seed} = Value{current_seed};\n"
-            
-            # Use the specific unit from variable definition instead of generic Units
-            units = var_def.get('units', 'mm')
-            matlab_content += f"hfssChangeVar(fid,'{var_def['name']}',num{current_seed},'{units}');\n\n"
-        
-        current_seed += 1
-    
-    # Generate material property assignments
-    for var_id in material_ids:
-        var_def = VARIABLE_DEFINITIONS[var_id]
-        
-        # Add original formula as comment
-        matlab_content += f"% Material Property: {var_def['name']} - {var_def['description']}\n"
-        matlab_content += f"% Original: {var_def['formula']}\n"
-        
-        # Get material properties
-        material_name = var_def.get('material_name', 'unknown')
-        property_name = var_def.get('material_property', 'permittivity')
-        var_name = var_def.get('var_name', f'mat{current_seed}')
-        units = var_def.get('units', '')
-        
-        # Generate new formula with reassigned seed
-        offset_str = f"{var_def['offset']:+g}" if var_def['offset'] != 0 else ""
-        matlab_content += f"{var_name} = {var_def['multiplier']}*seed({current_seed}){offset_str};\n"
-        
-        # Apply rounding if specified
-        if var_def.get('precision') is not None:
-            matlab_content += f"{var_name} = round({var_name}, {var_def['precision']});\n"
-        
-        # Use hfssChangeMaterialProperty to modify material property
-        matlab_content += f"hfssChangeMaterialProperty(fid, '{material_name}', '{property_name}', {var_name}, '{units}');\n\n"
-        
+    for var_id in optimization_ids + material_ids:
+        parts.append(precompiled[var_id]['block'].format(seed=current_seed))
         current_seed += 1
     
     # Add custom variables (ground plane parameters) with placeholder values
     # These will be updated by the update-ground-plane endpoint
     # IMPORTANT: GND_xPos and GND_yPos represent the CENTER of the 25x25mm antenna
     for var_id in custom_ids:
-        var_def = VARIABLE_DEFINITIONS[var_id]
-        matlab_content += f"% Custom variable: {var_def['name']} - {var_def['formula']}\n"
+        var_def = definitions[var_id]
+        parts.append(f"% Custom variable: {var_def['name']} - {var_def['formula']}\n")
         
         # Set default values for ground plane parameters
-        if var_id == 83:  # Lgx
-            matlab_content += f"Lgx = 25;  % Ground plane length X (mm) - default/will be updated by UI\n"
-            matlab_content += f"hfssChangeVar(fid,'Lgx',Lgx,'mm');\n\n"
-        elif var_id == 84:  # Lgy
-            matlab_content += f"Lgy = 25;  % Ground plane length Y (mm) - default/will be updated by UI\n"
-            matlab_content += f"hfssChangeVar(fid,'Lgy',Lgy,'mm');\n\n"
-        elif var_id == 85:  # GND_xPos
-            matlab_content += f"GND_xPos = 12.5;  % Antenna X center position (mm) - default/will be updated by UI\n"
-            matlab_content += f"hfssChangeVar(fid,'GND_xPos',GND_xPos,'mm');\n\n"
-        elif var_id == 86:  # GND_yPos
-            matlab_content += f"GND_yPos = 12.5;  % Antenna Y center position (mm) - default/will be updated by UI\n"
-            matlab_content += f"hfssChangeVar(fid,'GND_yPos',GND_yPos,'mm');\n\n"
+        if var_id in _GND_META:
+            name, comment, default = _GND_META[var_id]
+            parts.append(_GND_VAR_TPL.format(name=name, comment=comment, default=default))
     
-    matlab_content += "end\n"
+    parts.append("end\n")
     
-    return matlab_content
+    return ''.join(parts), (optimization_ids, custom_ids, material_ids)
 
 def main():
     """Main function to handle command line arguments and generate F_Model_Element.m"""
     
-    print(f"Execution ID {EXECUTION_ID}: Starting main function")
+    args = strip_quiet_flags(sys.argv[1:])
+    
+    if len(args) not in [1, 2]:
+        log("Usage: python generate_f_model.py <variable_ids> [project_root] [-q|--quiet]", always=True)
+        log("Example: python generate_f_model.py '1,2,3,4,5'", always=True)
+        log("Example: python generate_f_model.py '1,2,3,4,5' 'C:\\Users\\cheon\\Downloads\\MOEA_D_DE_0923'", always=True)
+        sys.exit(1)
+    
+    # Generate unique execution ID for debugging
+    execution_id = os.urandom(4).hex()
+    
+    log(f"Script execution started - ID: {execution_id}")
+    log(f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    log(f"Arguments: {sys.argv}")
+    log(f"Execution ID {execution_id}: Starting main function")
     
-    if len(sys.argv) not in [2, 3]:
-        print("Usage: python generate_f_model.py <variable_ids> [project_root]")
-        print("Example: python generate_f_model.py '1,2,3,4,5'")
-        print("Example: python generate_f_model.py '1,2,3,4,5' 'C:\\Users\\cheon\\Downloads\\MOEA_D_DE_0923'")
+    # Load variable definitions from external configuration (only once the
+    # arguments are known to be usable)
+    try:
+        definitions, metadata = _get_defs()
+        log(f"✅ Loaded {len(definitions)} variables from external configuration")
+        log(f"   Configuration version: {metadata.get('version', 'unknown')}")
+    except Exception as e:
+        log(f"❌ Failed to load variable configuration: {e}", always=True)
         sys.exit(1)
     
     try:
-        variable_ids_str = sys.argv[1]
-        print(f"Processing variable IDs: {variable_ids_str}")
+        variable_ids_str = args[0]
+        log(f"Processing variable IDs: {variable_ids_str}")
         
         # Determine project root
-        if len(sys.argv) == 3:
+        if len(args) == 2:
             # Use provided project root path
-            project_root = sys.argv[2]
-            print(f"Using provided project root: {project_root}")
+            project_root = Path(args[1])
+            log(f"Using provided project root: {project_root}")
         else:
             # Fall back to parent of scripts directory (backward compatibility)
-            project_root = os.path.dirname(os.path.dirname(__file__))
-            print(f"Using default project root: {project_root}")
+            project_root = Path(__file__).resolve().parent.parent
+            log(f"Using default project root: {project_root}")
         
-        # Validate project root exists
-        if not os.path.exists(project_root):
-            print(f"Error: Project root directory does not exist: {project_root}")
-            sys.exit(1)
+        # Resolve the project root once; every path below is joined onto it
+        project_root = project_root.resolve()
         
         # Generate MATLAB content
-        matlab_content = generate_f_model_element(variable_ids_str)
-        variable_count = len([x for x in variable_ids_str.split(',') if x.strip()])
+        ids_list = _parse_ids(variable_ids_str)
+        matlab_content, (_, custom_ids, material_ids) = generate_f_model_element(ids_list)
+        variable_count = len(ids_list)
         
         # Count custom and material variables for reporting
-        ids_list = [int(x.strip()) for x in variable_ids_str.split(',') if x.strip()]
-        custom_count = sum(1 for vid in ids_list if VARIABLE_DEFINITIONS.get(vid, {}).get('custom', False))
-        material_count = sum(1 for vid in ids_list if VARIABLE_DEFINITIONS.get(vid, {}).get('category') == 'material')
+        custom_count = len(custom_ids)
+        material_count = len(material_ids)
         optimization_count = variable_count - custom_count
         
-        # Create Function/HFSS directory if it doesn't exist
-        function_hfss_dir = os.path.join(project_root, 'Function', 'HFSS')
-        os.makedirs(function_hfss_dir, exist_ok=True)
-        print(f"Created/verified directory: {function_hfss_dir}")
+        # Create Function/HFSS directory if it doesn't exist. Only the two leaf
+        # directories are created, so a missing project root fails here
+        # instead of being created silently.
+        function_dir = project_root / 'Function'
+        function_hfss_dir = function_dir / 'HFSS'
+        for directory in (function_dir, function_hfss_dir):
+            try:
+                directory.mkdir(exist_ok=True)
+            except FileNotFoundError:
+                log(f"Error: Project root directory does not exist: {project_root}", always=True)
+                sys.exit(1)
+        log(f"Created/verified directory: {function_hfss_dir}")
         
         # Set output file path in Function\HFSS directory
-        output_file = os.path.join(function_hfss_dir, 'F_Model_Element.m')
-        output_file = os.path.abspath(output_file)
-        
-        # Also check for .mlx file
-        output_file_mlx = os.path.join(function_hfss_dir, 'F_Model_Element.mlx')
-        output_file_mlx = os.path.abspath(output_file_mlx)
+        output_file = function_hfss_dir / 'F_Model_Element.m'
         
         # Create the new F_Model_Element.m file
         # Note: All backup and deletion of old files is handled by manage_optimization_data.py
-        print("Creating new F_Model_Element.m file...")
+        log("Creating new F_Model_Element.m file...")
         
-        # Handle read-only files by removing read-only attribute
-        if os.path.exists(output_file):
+        # Handle read-only files by removing read-only attribute (one stat covers
+        # both the existence and the permission check)
+        try:
+            output_stat = output_file.stat()
+        except FileNotFoundError:
+            output_stat = None
+        
+        if output_stat is not None:
             try:
                 # On Windows, remove read-only attribute if present
                 if sys.platform == "win32":
-                    import stat
-                    current_mode = os.stat(output_file).st_mode
-                    if not (current_mode & stat.S_IWRITE):
-                        print(f"⚠️ File is read-only, removing read-only attribute...")
-                        os.chmod(output_file, stat.S_IWRITE | stat.S_IREAD)
-                        print(f"✅ Read-only attribute removed")
+                    if not (output_stat.st_mode & stat.S_IWRITE):
+                        log(f"⚠️ File is read-only, removing read-only attribute...", always=True)
+                        output_file.chmod(stat.S_IWRITE | stat.S_IREAD)
+                        log(f"✅ Read-only attribute removed")
             except Exception as perm_error:
-                print(f"❌ Could not remove read-only attribute: {perm_error}")
-                print(f"   Please manually remove read-only attribute from:")
-                print(f"   {output_file}")
+                log(f"❌ Could not remove read-only attribute: {perm_error}", always=True)
+                log(f"   Please manually remove read-only attribute from:", always=True)
+                log(f"   {output_file}", always=True)
                 raise
         
-        # Write new file to Function\HFSS directory
+        # Write new file to Function\HFSS directory. The content goes to a temporary
+        # file first and is then moved over the target in one atomic step, so a
+        # crash or a locked target never leaves a half-written F_Model_Element.m
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(matlab_content)
+            tmp_file.write_text(matlab_content, encoding='utf-8')
+            tmp_file.replace(output_file)
         except PermissionError as e:
-            print(f"❌ Permission denied when writing file")
-            print(f"   File: {output_file}")
-            print(f"   Possible causes:")
-            print(f"   1. File is open in MATLAB or another editor")
-            print(f"   2. File is read-only (check Properties > Attributes)")
-            print(f"   3. Antivirus is blocking the write operation")
-            print(f"   4. Insufficient user permissions")
-            print(f"   Solution: Close the file if it's open, or run: attrib -r \"{output_file}\"")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+            log(f"❌ Permission denied when writing file", always=True)
+            log(f"   File: {output_file}", always=True)
+            log(f"   Possible causes:", always=True)
+            log(f"   1. File is open in MATLAB or another editor", always=True)
+            log(f"   2. File is read-only (check Properties > Attributes)", always=True)
+            log(f"   3. Antivirus is blocking the write operation", always=True)
+            log(f"   4. Insufficient user permissions", always=True)
+            log(f"   Solution: Close the file if it's open, or run: attrib -r \"{output_file}\"", always=True)
             raise
         
-        print(f"F_Model_Element.m generated successfully")
-        print(f"Output file: {output_file}")
-        print(f"Total variables selected: {variable_count}")
-        print(f"Optimization variables: {optimization_count - material_count}")
-        print(f"Material variables: {material_count}")
-        print(f"Custom variables (ground plane): {custom_count}")
-        print(f"Seed range: 1-{optimization_count + material_count}")
+        log(f"F_Model_Element.m generated successfully")
+        log(f"Output file: {output_file}")
+        log(f"Total variables selected: {variable_count}")
+        log(f"Optimization variables: {optimization_count - material_count}")
+        log(f"Material variables: {material_count}")
+        log(f"Custom variables (ground plane): {custom_count}")
+        log(f"Seed range: 1-{optimization_count + material_count}")
         
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log(f"Error: {str(e)}", always=True)
         sys.exit(1)
 
 if __name__ == "__main__":
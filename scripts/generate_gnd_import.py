@@ -11,7 +11,7 @@ This script creates the F_GND_Import.m file with:
 - Fixed HFSS variables (thick, H2, probe, Rg, Hg)
 
 Usage:
-    python generate_gnd_import.py <dxf_path> <gnd_x_pos> <gnd_y_pos> <project_root>
+    python generate_gnd_import.py <dxf_path> <gnd_x_pos> <gnd_y_pos> <project_root> [-q|--quiet]
 
 Example:
     python generate_gnd_import.py "C:/uploads/gnd_files/custom_gnd.dxf" 40.5 35.2 "C:/MOEA_D_DE_0923"
@@ -19,47 +19,23 @@ Example:
 
 import sys
 import os
+import stat
 import uuid
 from datetime import datetime
 
-# Set UTF-8 encoding for console output
-if sys.platform == "win32":
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+# Buffered console output; -q / --quiet prints only warnings and errors
+from console_log import log, strip_quiet_flags
 
 # Generate unique execution ID for debugging
 EXECUTION_ID = str(uuid.uuid4())[:8]
 
-print(f"Script execution started - ID: {EXECUTION_ID}")
-print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-print(f"Arguments: {sys.argv}")
+log(f"Script execution started - ID: {EXECUTION_ID}")
+log(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
+log(f"Arguments: {sys.argv}")
 
 
-def generate_gnd_import_function(dxf_path=None, gnd_x_pos=None, gnd_y_pos=None):
-    """
-    Generate F_GND_Import.m content with custom DXF path and antenna positioning
-    
-    Parameters:
-    -----------
-    dxf_path : str or None
-        Full path to the DXF file (will be converted to forward slashes for MATLAB)
-        If None, generates empty function that does nothing
-    gnd_x_pos : float or None
-        X position for antenna center on ground plane (mm)
-    gnd_y_pos : float or None
-        Y position for antenna center on ground plane (mm)
-    
-    Returns:
-    --------
-    str : MATLAB function code
-    """
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # If no DXF path provided, generate empty function
-    if dxf_path is None or dxf_path == '' or dxf_path.lower() == 'none':
-        matlab_content = f"""function F_GND_Import(fid, Units)
+# F_GND_Import.m templates, filled with str.format_map
+_TEMPLATE_EMPTY = """function F_GND_Import(fid, Units)
 % Custom ground plane import (DISABLED)
 % Generated: {timestamp}
 %
@@ -72,19 +48,8 @@ fprintf('No custom ground plane to import\\n');
 
 end
 """
-        return matlab_content
-    
-    # Convert Windows backslashes to forward slashes for MATLAB compatibility
-    matlab_dxf_path = dxf_path.replace('\\', '/')
-    
-    # Format floating point values
-    x_pos_str = f"{float(gnd_x_pos):.2f}"
-    y_pos_str = f"{float(gnd_y_pos):.2f}"
-    
-    # Convert to absolute path for DXF file
-    absolute_dxf_path = os.path.abspath(dxf_path).replace('\\', '/')
-    
-    matlab_content = f"""function F_GND_Import(fid, Units)
+
+_TEMPLATE_IMPORT = """function F_GND_Import(fid, Units)
 % Import DXF ground plane and complete setup
 % Generated: {timestamp}
 % F_GND_Import(fid, Units)
@@ -115,139 +80,179 @@ hfssImportAndSetupGND(fid, DxfPath, GND_xPos, GND_yPos, Units);
 
 end
 """
+
+
+def generate_gnd_import_function(dxf_path=None, gnd_x_pos=None, gnd_y_pos=None):
+    """
+    Generate F_GND_Import.m content with custom DXF path and antenna positioning
+    
+    Parameters:
+    -----------
+    dxf_path : str or None
+        Full path to the DXF file (will be converted to forward slashes for MATLAB)
+        If None, generates empty function that does nothing
+    gnd_x_pos : float or None
+        X position for antenna center on ground plane (mm)
+    gnd_y_pos : float or None
+        Y position for antenna center on ground plane (mm)
+    
+    Returns:
+    --------
+    str : MATLAB function code
+    """
+    
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    template, fields = _template_fields(dxf_path, gnd_x_pos, gnd_y_pos)
+    return template.format_map({'timestamp': timestamp, **fields})
+
+
+def _template_fields(dxf_path, gnd_x_pos, gnd_y_pos):
+    """
+    Select the F_GND_Import.m template and its values for the given arguments
+    
+    Everything except the timestamp is fixed by the arguments.
+    """
+    
+    # If no DXF path provided, generate empty function
+    if dxf_path is None or dxf_path == '' or dxf_path.lower() == 'none':
+        template = _TEMPLATE_EMPTY
+        fields = {}
+    else:
+        template = _TEMPLATE_IMPORT
+        fields = {
+            # Convert to absolute path for DXF file
+            # (Windows backslashes become forward slashes for MATLAB compatibility)
+            'absolute_dxf_path': os.path.abspath(dxf_path).replace('\\', '/'),
+            # Format floating point values
+            'x_pos_str': f"{float(gnd_x_pos):.2f}",
+            'y_pos_str': f"{float(gnd_y_pos):.2f}",
+        }
     
-    return matlab_content
+    return template, fields
+
+
+def _without_timestamp(content):
+    """Drop the '% Generated:' line, the only line that differs between runs"""
+    return [line for line in content.splitlines(keepends=True) if not line.startswith('% Generated: ')]
+
+
+def _is_up_to_date(output_file, content):
+    """Check whether output_file already holds content, apart from its timestamp"""
+    try:
+        with open(output_file, 'r', encoding='utf-8') as f:
+            existing = f.read()
+    except (OSError, UnicodeDecodeError):
+        return False
+    return _without_timestamp(existing) == _without_timestamp(content)
+
+
+def _write_matlab(output_file, content):
+    """Write MATLAB code to output_file, removing a read-only attribute first"""
+    # Handle read-only files by removing read-only attribute
+    if sys.platform == "win32":
+        try:
+            # On Windows, remove read-only attribute if present
+            current_mode = os.stat(output_file).st_mode
+            if not (current_mode & stat.S_IWRITE):
+                log(f"⚠️ File is read-only, removing read-only attribute...")
+                os.chmod(output_file, stat.S_IWRITE | stat.S_IREAD)
+                log(f"✅ Read-only attribute removed")
+        except FileNotFoundError:
+            pass
+        except Exception as perm_error:
+            log(f"❌ Could not remove read-only attribute: {perm_error}", always=True)
+    
+    # Single buffered write of the whole file
+    with open(output_file, 'w', encoding='utf-8', buffering=65536) as f:
+        f.write(content)
 
 
 def main():
     """Main function to handle command line arguments and generate F_GND_Import.m"""
     
-    print(f"Execution ID {EXECUTION_ID}: Starting main function")
+    log(f"Execution ID {EXECUTION_ID}: Starting main function")
+    
+    args = strip_quiet_flags(sys.argv[1:])
     
-    # Support both 2 arguments (clear mode) and 5 arguments (import mode)
-    if len(sys.argv) not in [2, 5]:
-        print("Usage:")
-        print("  Clear mode:  python generate_gnd_import.py <project_root>")
-        print("  Import mode: python generate_gnd_import.py <dxf_path> <gnd_x_pos> <gnd_y_pos> <project_root>")
-        print("Example (clear):  python generate_gnd_import.py 'C:/MOEA_D_DE_0923'")
-        print("Example (import): python generate_gnd_import.py 'C:/uploads/gnd_files/custom_gnd.dxf' 40.5 35.2 'C:/MOEA_D_DE_0923'")
+    # Support both 1 argument (clear mode) and 4 arguments (import mode)
+    if len(args) not in [1, 4]:
+        log("Usage:", always=True)
+        log("  Clear mode:  python generate_gnd_import.py <project_root>", always=True)
+        log("  Import mode: python generate_gnd_import.py <dxf_path> <gnd_x_pos> <gnd_y_pos> <project_root>", always=True)
+        log("  Add -q / --quiet to print only warnings and errors", always=True)
+        log("Example (clear):  python generate_gnd_import.py 'C:/MOEA_D_DE_0923'", always=True)
+        log("Example (import): python generate_gnd_import.py 'C:/uploads/gnd_files/custom_gnd.dxf' 40.5 35.2 'C:/MOEA_D_DE_0923'", always=True)
         sys.exit(1)
     
     try:
+        clear_mode = len(args) == 1
+        
         # Clear mode - generate empty F_GND_Import.m
-        if len(sys.argv) == 2:
-            project_root = sys.argv[1]
-            
-            print(f"Clear mode: Generating empty F_GND_Import.m")
-            print(f"  Project Root: {project_root}")
+        if clear_mode:
+            dxf_path = gnd_x_pos = gnd_y_pos = None
+            project_root = args[0]
             
-            # Validate project root exists
-            if not os.path.exists(project_root):
-                print(f"Error: Project root directory does not exist: {project_root}")
-                sys.exit(1)
-            
-            # Generate empty MATLAB function
-            matlab_content = generate_gnd_import_function(dxf_path=None, gnd_x_pos=None, gnd_y_pos=None)
-            
-            # Create Function/HFSS directory if it doesn't exist
-            function_hfss_dir = os.path.join(project_root, 'Function', 'HFSS')
-            os.makedirs(function_hfss_dir, exist_ok=True)
-            print(f"Created/verified directory: {function_hfss_dir}")
-            
-            # Set output file path in Function\HFSS directory
-            output_file = os.path.join(function_hfss_dir, 'F_GND_Import.m')
-            output_file = os.path.abspath(output_file)
-            
-            # Write the empty F_GND_Import.m file
-            print("Creating empty F_GND_Import.m file...")
-            
-            # Handle read-only files by removing read-only attribute
-            if os.path.exists(output_file):
-                try:
-                    # On Windows, remove read-only attribute if present
-                    if sys.platform == "win32":
-                        import stat
-                        current_mode = os.stat(output_file).st_mode
-                        if not (current_mode & stat.S_IWRITE):
-                            print(f"⚠️ File is read-only, removing read-only attribute...")
-                            os.chmod(output_file, stat.S_IWRITE | stat.S_IREAD)
-                            print(f"✅ Read-only attribute removed")
-                except Exception as perm_error:
-                    print(f"❌ Could not remove read-only attribute: {perm_error}")
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(matlab_content)
-            
-            print(f"✅ F_GND_Import.m cleared successfully")
-            print(f"   Output file: {output_file}")
-            print(f"   Mode: No custom GND import (function does nothing)")
+            log(f"Clear mode: Generating empty F_GND_Import.m")
+            log(f"  Project Root: {project_root}")
         
         # Import mode - generate F_GND_Import.m with custom DXF
         else:
-            dxf_path = sys.argv[1]
-            gnd_x_pos = float(sys.argv[2])
-            gnd_y_pos = float(sys.argv[3])
-            project_root = sys.argv[4]
+            dxf_path = args[0]
+            gnd_x_pos = float(args[1])
+            gnd_y_pos = float(args[2])
+            project_root = args[3]
             
-            print(f"Import mode: Processing custom GND import")
-            print(f"  DXF Path: {dxf_path}")
-            print(f"  Antenna Position: ({gnd_x_pos}, {gnd_y_pos}) mm")
-            print(f"  Project Root: {project_root}")
+            log(f"Import mode: Processing custom GND import")
+            log(f"  DXF Path: {dxf_path}")
+            log(f"  Antenna Position: ({gnd_x_pos}, {gnd_y_pos}) mm")
+            log(f"  Project Root: {project_root}")
             
             # Validate DXF file exists
             if not os.path.exists(dxf_path):
-                print(f"Warning: DXF file does not exist: {dxf_path}")
-                print(f"         File will be referenced anyway (may exist at runtime)")
-            
-            # Validate project root exists
-            if not os.path.exists(project_root):
-                print(f"Error: Project root directory does not exist: {project_root}")
-                sys.exit(1)
-            
-            # Generate MATLAB content
-            matlab_content = generate_gnd_import_function(dxf_path, gnd_x_pos, gnd_y_pos)
-            
-            # Create Function/HFSS directory if it doesn't exist
-            function_hfss_dir = os.path.join(project_root, 'Function', 'HFSS')
-            os.makedirs(function_hfss_dir, exist_ok=True)
-            print(f"Created/verified directory: {function_hfss_dir}")
-            
-            # Set output file path in Function\HFSS directory
-            output_file = os.path.join(function_hfss_dir, 'F_GND_Import.m')
-            output_file = os.path.abspath(output_file)
-            
-            # Write the new F_GND_Import.m file
-            print("Creating F_GND_Import.m file...")
-            
-            # Handle read-only files by removing read-only attribute
-            if os.path.exists(output_file):
-                try:
-                    # On Windows, remove read-only attribute if present
-                    if sys.platform == "win32":
-                        import stat
-                        current_mode = os.stat(output_file).st_mode
-                        if not (current_mode & stat.S_IWRITE):
-                            print(f"⚠️ File is read-only, removing read-only attribute...")
-                            os.chmod(output_file, stat.S_IWRITE | stat.S_IREAD)
-                            print(f"✅ Read-only attribute removed")
-                except Exception as perm_error:
-                    print(f"❌ Could not remove read-only attribute: {perm_error}")
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(matlab_content)
-            
-            print(f"✅ F_GND_Import.m generated successfully")
-            print(f"   Output file: {output_file}")
-            print(f"   DXF File: {dxf_path}")
-            print(f"   Antenna Position: ({gnd_x_pos}, {gnd_y_pos}) mm")
-            print(f"   GND Import Position: ({-gnd_x_pos}, {-gnd_y_pos}, -H2)")
+                log(f"Warning: DXF file does not exist: {dxf_path}", always=True)
+                log(f"         File will be referenced anyway (may exist at runtime)", always=True)
+        
+        # Validate project root exists
+        if not os.path.exists(project_root):
+            log(f"Error: Project root directory does not exist: {project_root}", always=True)
+            sys.exit(1)
+        
+        # Generate MATLAB content (empty function in clear mode)
+        matlab_content = generate_gnd_import_function(dxf_path, gnd_x_pos, gnd_y_pos)
+        
+        # Create Function/HFSS directory if it doesn't exist
+        function_hfss_dir = os.path.join(project_root, 'Function', 'HFSS')
+        os.makedirs(function_hfss_dir, exist_ok=True)
+        log(f"Created/verified directory: {function_hfss_dir}")
+        
+        # Set output file path in Function\HFSS directory
+        output_file = os.path.join(function_hfss_dir, 'F_GND_Import.m')
+        output_file = os.path.abspath(output_file)
+        
+        # Write the F_GND_Import.m file
+        log("Creating empty F_GND_Import.m file..." if clear_mode else "Creating F_GND_Import.m file...")
+        if _is_up_to_date(output_file, matlab_content):
+            log("F_GND_Import.m already up to date, skipping write")
+        else:
+            _write_matlab(output_file, matlab_content)
+        
+        if clear_mode:
+            log(f"✅ F_GND_Import.m cleared successfully")
+            log(f"   Output file: {output_file}")
+            log(f"   Mode: No custom GND import (function does nothing)")
+        else:
+            log(f"✅ F_GND_Import.m generated successfully")
+            log(f"   Output file: {output_file}")
+            log(f"   DXF File: {dxf_path}")
+            log(f"   Antenna Position: ({gnd_x_pos}, {gnd_y_pos}) mm")
+            log(f"   GND Import Position: ({-gnd_x_pos}, {-gnd_y_pos}, -H2)")
         
     except ValueError as e:
-        print(f"❌ Error: Invalid position values. X and Y must be numeric.")
-        print(f"   Details: {str(e)}")
+        log(f"❌ Error: Invalid position values. X and Y must be numeric.", always=True)
+        log(f"   Details: {str(e)}", always=True)
         sys.exit(1)
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        log(f"❌ Error: {str(e)}", always=True)
         import traceback
         traceback.print_exc()
         sys.exit(1)
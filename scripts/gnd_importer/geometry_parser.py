@@ -4,7 +4,114 @@ Supports: DXF, STL, STEP (future), HFSS VBScript
 """
 
 from pathlib import Path
+import functools
 import json
+import math
+import os
+
+import numpy as np
+
+# Circles are approximated with a polygon whose segment count follows the
+# radius: at most CIRCLE_CHORD_TOLERANCE mm between chord and arc
+CIRCLE_CHORD_TOLERANCE = 0.2
+_CIRCLE_MIN_SEGMENTS = 12
+_CIRCLE_MAX_SEGMENTS = 128
+
+
+def _circle_segments(radius):
+    """Number of polygon segments needed to approximate a circle of radius"""
+    ratio = 1 - CIRCLE_CHORD_TOLERANCE / max(radius, CIRCLE_CHORD_TOLERANCE)
+    segments = math.ceil(math.pi / math.acos(max(0.0, ratio)))
+    return max(_CIRCLE_MIN_SEGMENTS, min(_CIRCLE_MAX_SEGMENTS, segments))
+
+
+@functools.lru_cache(maxsize=None)
+def _unit_circle(segments):
+    """Unit-circle samples and closed-loop edges for a segment count (computed once)"""
+    angles = 2 * np.pi * np.arange(segments) / segments
+    edges = [(i, (i + 1) % segments) for i in range(segments)]
+    return np.cos(angles), np.sin(angles), edges
+
+
+# Vertex deduplication tolerance (1e-6 mm), stored as its reciprocal so
+# quantization is a multiply instead of a divide
+_INV_EPSILON = 1e6
+
+# Parsed DXF/STL geometry is cached next to the source file
+_CACHE_DIR_NAME = '.gnd_cache'
+_CACHEABLE_FORMATS = ('.dxf', '.stl')
+_CACHE_VERSION = 2  # Bump whenever parser output changes for the same file
+
+# From this many rows on, the numba hash table replaces np.unique (if available)
+_HASH_DEDUP_MIN_ROWS = 400000
+
+
+@functools.lru_cache(maxsize=1)
+def _hash_dedup_kernel():
+    """Compiled open-addressing dedup of (N, 3) int64 keys, None without numba
+    
+    numba is imported here rather than at module level so small imports do
+    not pay its start-up cost.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True)
+    def hash_dedup(keys):
+        n = keys.shape[0]
+        size = 1
+        while size < 2 * n:
+            size <<= 1
+        mask = size - 1
+        table = np.full(size, -1, np.int64)  # slot -> unique id
+        first = np.empty(n, np.int64)        # unique id -> first row
+        index = np.empty(n, np.int64)        # row -> unique id
+        count = 0
+        for r in range(n):
+            h = (keys[r, 0] * 73856093) ^ (keys[r, 1] * 19349663) ^ (keys[r, 2] * 83492791)
+            pos = h & mask
+            while True:
+                slot = table[pos]
+                if slot < 0:
+                    table[pos] = count
+                    first[count] = r
+                    index[r] = count
+                    count += 1
+                    break
+                f = first[slot]
+                if keys[f, 0] == keys[r, 0] and keys[f, 1] == keys[r, 1] and keys[f, 2] == keys[r, 2]:
+                    index[r] = slot
+                    break
+                pos = (pos + 1) & mask  # linear probing
+        return first[:count].copy(), index
+    
+    return hash_dedup
+
+
+def _unique_rows(keys):
+    """Deduplicate rows of a 2D integer array in one vectorized pass
+    
+    Returns (first_index, row_index): the position of each unique row's first
+    occurrence, and each input row's unique id. Ids are numbered in order of
+    first appearance, matching an incremental dict-based deduplication.
+    """
+    if len(keys) >= _HASH_DEDUP_MIN_ROWS and keys.shape[1] == 3:
+        kernel = _hash_dedup_kernel()
+        if kernel is not None:
+            try:
+                return kernel(np.ascontiguousarray(keys, dtype=np.int64))
+            except Exception:
+                pass  # e.g. stale compile cache, use np.unique below
+    
+    _, first_index, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first_index[order], rank[inverse.reshape(-1)]
+
 
 class Geometry:
     """Generic geometry container"""
@@ -16,8 +123,6 @@ class Geometry:
     
     def to_dict(self):
         """Convert geometry to JSON-serializable dict"""
-        import numpy as np
-        
         # Convert numpy types to native Python types
         def convert_value(val):
             if isinstance(val, (np.integer, np.floating)):
@@ -28,10 +133,20 @@ class Geometry:
                 return [convert_value(v) for v in val]
             return val
         
+        def to_list(values, dtype):
+            # One C-level conversion for regular (N, k) data
+            if len(values) == 0:
+                return []
+            try:
+                return np.asarray(values, dtype=dtype).tolist()
+            except ValueError:
+                # Ragged rows - fall back to element-wise conversion
+                return convert_value(values)
+        
         return {
-            'vertices': convert_value(self.vertices),
-            'faces': convert_value(self.faces),
-            'edges': convert_value(self.edges),
+            'vertices': to_list(self.vertices, np.float64),
+            'faces': to_list(self.faces, np.int64),
+            'edges': to_list(self.edges, np.int64),
             'metadata': self.metadata
         }
 
@@ -41,8 +156,56 @@ class GeometryParser:
         self.file_path = Path(file_path)
         self.format = self.file_path.suffix.lower()
     
-    def parse(self):
+    def parse(self, use_cache=True):
         """Parse geometry based on file format"""
+        if use_cache and self.format in _CACHEABLE_FORMATS:
+            return self._cached_parse()
+        return self._parse_format()
+    
+    def _cached_parse(self):
+        """parse() backed by an .npz sidecar keyed on the file's (mtime, size)"""
+        try:
+            st = self.file_path.stat()
+        except OSError:
+            return self._parse_format()  # Let the parser report the missing file
+        source = np.array([_CACHE_VERSION, st.st_mtime_ns, st.st_size], dtype=np.int64)
+        cache_file = self.file_path.parent / _CACHE_DIR_NAME / f"{self.file_path.name}.npz"
+        
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                if np.array_equal(data['source'], source):
+                    geometry = Geometry()
+                    geometry.vertices = data['vertices'].tolist()
+                    geometry.faces = data['faces'].tolist()
+                    geometry.edges = data['edges'].tolist()
+                    geometry.metadata = json.loads(str(data['metadata']))
+                    return geometry
+        except Exception:
+            pass  # Missing, stale or unreadable cache - parse again
+        
+        geometry = self._parse_format()
+        
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            cache_file.parent.mkdir(exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                np.savez(f, source=source,
+                         vertices=np.asarray(geometry.vertices, dtype=np.float64),
+                         faces=np.asarray(geometry.faces, dtype=np.int64),
+                         edges=np.asarray(geometry.edges, dtype=np.int64),
+                         metadata=np.array(json.dumps(geometry.metadata)))
+            tmp_file.replace(cache_file)
+        except (OSError, TypeError, ValueError):
+            # Caching is best effort (read-only upload dir, ragged data, ...)
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+        
+        return geometry
+    
+    def _parse_format(self):
+        """Dispatch to the format-specific parser"""
         if self.format == '.dxf':
             return self._parse_dxf()
         elif self.format == '.stl':
@@ -61,84 +224,84 @@ class GeometryParser:
         except ImportError:
             raise ImportError("ezdxf library required. Install: pip install ezdxf")
         
-        doc = ezdxf.readfile(str(self.file_path))
+        # Plain read first; the slower recover loader only for damaged files
+        try:
+            doc = ezdxf.readfile(str(self.file_path))
+        except ezdxf.DXFStructureError:
+            from ezdxf import recover
+            doc, _auditor = recover.readfile(str(self.file_path))
         msp = doc.modelspace()
         
         geometry = Geometry()
         
-        # Use vertex map to deduplicate vertices (crucial for proper edge topology)
-        vertex_map = {}
-        epsilon = 1e-6  # Tolerance for vertex deduplication
-        
-        def add_vertex(x, y, z=0):
-            """Add vertex with deduplication"""
-            # Round to prevent floating point issues
-            key = (round(x / epsilon) * epsilon, 
-                   round(y / epsilon) * epsilon, 
-                   round(z / epsilon) * epsilon)
-            if key not in vertex_map:
-                vertex_map[key] = len(geometry.vertices)
-                geometry.vertices.append([float(x), float(y), float(z)])
-            return vertex_map[key]
-        
-        # Extract entities
-        for entity in msp:
-            if entity.dxftype() == 'LINE':
-                p1 = entity.dxf.start
-                p2 = entity.dxf.end
-                v1_idx = add_vertex(p1.x, p1.y, getattr(p1, 'z', 0))
-                v2_idx = add_vertex(p2.x, p2.y, getattr(p2, 'z', 0))
-                geometry.edges.append([v1_idx, v2_idx])
-            
-            elif entity.dxftype() == 'LWPOLYLINE':
-                points = [(p[0], p[1], 0) for p in entity.get_points()]
-                indices = [add_vertex(p[0], p[1], p[2]) for p in points]
-                for i in range(len(indices)-1):
-                    geometry.edges.append([indices[i], indices[i + 1]])
-                # Close polyline if needed
-                if entity.closed and len(indices) > 0:
-                    geometry.edges.append([indices[-1], indices[0]])
-            
-            elif entity.dxftype() == 'POLYLINE':
-                points = [(p.dxf.location.x, p.dxf.location.y, 
-                          getattr(p.dxf.location, 'z', 0)) 
-                         for p in entity.vertices]
-                indices = [add_vertex(p[0], p[1], p[2]) for p in points]
-                for i in range(len(indices)-1):
-                    geometry.edges.append([indices[i], indices[i + 1]])
-                # Close if it's a closed polyline
-                if entity.is_closed and len(indices) > 0:
-                    geometry.edges.append([indices[-1], indices[0]])
-            
-            elif entity.dxftype() == '3DFACE':
-                vertices_idx = []
-                for point in [entity.dxf.vtx0, entity.dxf.vtx1, entity.dxf.vtx2]:
-                    idx = add_vertex(point.x, point.y, getattr(point, 'z', 0))
-                    vertices_idx.append(idx)
-                geometry.faces.append(vertices_idx)
+        # Collect raw points per entity first; deduplication happens afterwards
+        # in a single vectorized pass (crucial for proper edge topology)
+        points = []     # (x, y, z) in entity order
+        raw_edges = []  # pairs of indices into points
+        raw_faces = []  # triples of indices into points
+        
+        def add_chain(chain, closed):
+            """Add a polyline's points and the edges connecting them"""
+            base = len(points)
+            points.extend(chain)
+            count = len(chain)
+            raw_edges.extend((base + i, base + i + 1) for i in range(count - 1))
+            # Close polyline if needed
+            if closed and count > 0:
+                raw_edges.append((base + count - 1, base))
+        
+        # Extract entities, one type-specific pass per supported entity type
+        for entity in msp.query('LINE'):
+            p1 = entity.dxf.start
+            p2 = entity.dxf.end
+            base = len(points)
+            points.append((p1.x, p1.y, getattr(p1, 'z', 0)))
+            points.append((p2.x, p2.y, getattr(p2, 'z', 0)))
+            raw_edges.append((base, base + 1))
+        
+        for entity in msp.query('LWPOLYLINE'):
+            add_chain([(p[0], p[1], 0) for p in entity.get_points()], entity.closed)
+        
+        for entity in msp.query('POLYLINE'):
+            add_chain([(p.dxf.location.x, p.dxf.location.y,
+                        getattr(p.dxf.location, 'z', 0))
+                       for p in entity.vertices], entity.is_closed)
+        
+        for entity in msp.query('3DFACE'):
+            base = len(points)
+            for point in [entity.dxf.vtx0, entity.dxf.vtx1, entity.dxf.vtx2]:
+                points.append((point.x, point.y, getattr(point, 'z', 0)))
+            raw_faces.append((base, base + 1, base + 2))
+        
+        for entity in msp.query('CIRCLE'):
+            center = entity.dxf.center
+            radius = entity.dxf.radius
+            base = len(points)
+            segments = _circle_segments(radius)
+            unit_cos, unit_sin, circle_edges = _unit_circle(segments)
+            xs = center.x + radius * unit_cos
+            ys = center.y + radius * unit_sin
+            points.extend(zip(xs.tolist(), ys.tolist(), [getattr(center, 'z', 0)] * segments))
+            # Create edges (closed loop)
+            raw_edges.extend((base + a, base + b) for a, b in circle_edges)
+        
+        if points:
+            coords = np.asarray(points, dtype=np.float64)
+            # Quantize to the tolerance grid and find unique vertices in one pass
+            keys = np.rint(coords * _INV_EPSILON).astype(np.int64)
+            first_index, vertex_index = _unique_rows(keys)
             
-            elif entity.dxftype() == 'CIRCLE':
-                # Approximate circle with polygon
-                center = entity.dxf.center
-                radius = entity.dxf.radius
-                segments = 32
-                import math
-                indices = []
-                for i in range(segments):
-                    angle = (2 * math.pi * i) / segments
-                    x = center.x + radius * math.cos(angle)
-                    y = center.y + radius * math.sin(angle)
-                    z = getattr(center, 'z', 0)
-                    indices.append(add_vertex(x, y, z))
-                # Create edges (closed loop)
-                for i in range(segments):
-                    geometry.edges.append([indices[i], indices[(i + 1) % segments]])
+            geometry.vertices = coords[first_index].tolist()
+            if raw_edges:
+                geometry.edges = vertex_index[np.asarray(raw_edges, dtype=np.int64)].tolist()
+            if raw_faces:
+                geometry.faces = vertex_index[np.asarray(raw_faces, dtype=np.int64)].tolist()
         
         geometry.metadata = {
             'units': 'mm',
             'source': 'DXF',
-            'layer_count': len(list(doc.layers)),
-            'entity_count': len(list(msp))
+            'layer_count': len(doc.layers),
+            'entity_count': len(msp)
         }
         
         return geometry
@@ -147,7 +310,6 @@ class GeometryParser:
         """Parse STL file using numpy-stl"""
         try:
             from stl import mesh
-            import numpy as np
         except ImportError:
             raise ImportError("numpy-stl required. Install: pip install numpy-stl")
         
@@ -156,17 +318,14 @@ class GeometryParser:
         geometry = Geometry()
         
         # Extract vertices and faces from STL triangles
-        vertex_map = {}  # To deduplicate vertices
-        for i, triangle in enumerate(stl_mesh.vectors):
-            face_indices = []
-            for vertex in triangle:
-                # Create a hashable key for the vertex
-                vertex_tuple = tuple(vertex)
-                if vertex_tuple not in vertex_map:
-                    vertex_map[vertex_tuple] = len(geometry.vertices)
-                    geometry.vertices.append(vertex.tolist())
-                face_indices.append(vertex_map[vertex_tuple])
-            geometry.faces.append(face_indices)
+        # (identical coordinates are deduplicated in one vectorized pass)
+        corners = stl_mesh.vectors.reshape(-1, 3)
+        if len(corners):
+            # Key on the float bit patterns; +0.0 folds -0.0 into 0.0 first
+            keys = (corners + np.float32(0.0)).view(np.uint32).astype(np.int64)
+            first_index, vertex_index = _unique_rows(keys)
+            geometry.vertices = corners[first_index].tolist()
+            geometry.faces = vertex_index.reshape(-1, 3).tolist()
         
         geometry.metadata = {
             'units': 'mm',
@@ -7,6 +7,17 @@ import sys
 import json
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 # Handle both direct script execution and module import
 if __name__ == '__main__':
     # Running as script - add parent directory to path
@@ -20,9 +31,11 @@ else:
     from .gnd_validator import GNDValidator
 
 class GNDLoader:
-    def __init__(self, file_path, project_path):
+    def __init__(self, file_path, project_path, validate=True, validation_profile='full'):
         self.file_path = Path(file_path)
         self.project_path = Path(project_path)
+        self.validate = validate
+        self.validation_profile = validation_profile
         self.format = self.file_path.suffix.lower()
         self.geometry = None
         self.bounds = None
@@ -33,12 +46,14 @@ class GNDLoader:
             parser = GeometryParser(self.file_path)
             self.geometry = parser.parse()
             
-            # Validate geometry
-            validator = GNDValidator(self.geometry)
-            validation_report = validator.get_report()
-            
-            if not validation_report['valid']:
-                raise ValueError(f"Invalid geometry: {', '.join(validation_report['errors'])}")
+            # Validate geometry (callers that only need bounds can skip it)
+            validation_report = None
+            if self.validate:
+                validator = GNDValidator(self.geometry, profile=self.validation_profile)
+                validation_report = validator.get_report()
+                
+                if not validation_report['valid']:
+                    raise ValueError(f"Invalid geometry: {', '.join(validation_report['errors'])}")
             
             # Calculate bounding box
             self.bounds = self.calculate_bounds()
@@ -61,41 +76,55 @@ class GNDLoader:
         if not vertices:
             return None
         
-        x_coords = [v[0] for v in vertices]
-        y_coords = [v[1] for v in vertices]
-        z_coords = [v[2] if len(v) > 2 else 0 for v in vertices]
+        # Single pass over all coordinates (missing Z treated as 0)
+        coords = np.asarray(vertices, dtype=np.float64)
+        if coords.shape[1] < 3:
+            coords = np.pad(coords, ((0, 0), (0, 3 - coords.shape[1])))
+        min_x, min_y, min_z = coords[:, :3].min(axis=0).tolist()
+        max_x, max_y, max_z = coords[:, :3].max(axis=0).tolist()
         
         return {
-            'min_x': float(min(x_coords)),
-            'max_x': float(max(x_coords)),
-            'min_y': float(min(y_coords)),
-            'max_y': float(max(y_coords)),
-            'min_z': float(min(z_coords)) if z_coords else 0,
-            'max_z': float(max(z_coords)) if z_coords else 0,
-            'width': float(max(x_coords) - min(x_coords)),
-            'height': float(max(y_coords) - min(y_coords)),
-            'depth': float(max(z_coords) - min(z_coords)) if z_coords else 0,
+            'min_x': min_x,
+            'max_x': max_x,
+            'min_y': min_y,
+            'max_y': max_y,
+            'min_z': min_z,
+            'max_z': max_z,
+            'width': max_x - min_x,
+            'height': max_y - min_y,
+            'depth': max_z - min_z,
             'center': [
-                float((min(x_coords) + max(x_coords)) / 2),
-                float((min(y_coords) + max(y_coords)) / 2),
-                float((min(z_coords) + max(z_coords)) / 2) if z_coords else 0
+                (min_x + max_x) / 2,
+                (min_y + max_y) / 2,
+                (min_z + max_z) / 2
             ]
         }
 
+def emit_json(obj):
+    """Write obj as compact JSON to stdout in a single write"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_json_dumps(obj) + b'\n')
+    sys.stdout.buffer.flush()
+
 def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({'success': False, 'error': 'Missing arguments. Usage: python gnd_loader.py <file_path> <project_path>'}))
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = set(arg for arg in sys.argv[1:] if arg.startswith('--'))
+    
+    if len(args) < 2:
+        emit_json({'success': False, 'error': 'Missing arguments. Usage: python gnd_loader.py <file_path> <project_path> [--quick | --no-validate]'})
         sys.exit(1)
     
-    file_path = sys.argv[1]
-    project_path = sys.argv[2]
+    file_path = args[0]
+    project_path = args[1]
     
     try:
-        loader = GNDLoader(file_path, project_path)
+        loader = GNDLoader(file_path, project_path,
+                           validate='--no-validate' not in flags,
+                           validation_profile='quick' if '--quick' in flags else 'full')
         result = loader.load()
-        print(json.dumps({'success': True, **result}, indent=2))
+        emit_json({'success': True, **result})
     except Exception as e:
-        print(json.dumps({'success': False, 'error': str(e)}, indent=2))
+        emit_json({'success': False, 'error': str(e)})
         sys.exit(1)
 
 if __name__ == '__main__':
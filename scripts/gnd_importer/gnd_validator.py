@@ -3,13 +3,77 @@ GND Validator - Validates ground plane geometry
 Checks for common issues and provides suggestions
 """
 
+import functools
+
+import numpy as np
+
+# Upper bound on (test point x edge) pairs evaluated per vectorized batch
+_MAX_BATCH_ELEMENTS = 1 << 20
+
+# Above this many edges the compiled kernel is used when numba is available
+_NUMBA_MIN_EDGES = 50000
+
+
+@functools.lru_cache(maxsize=1)
+def _fit_kernel():
+    """Compiled antenna fit search, None without numba
+    
+    numba is imported here rather than at module level so small geometries
+    do not pay its start-up cost.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(cache=True, parallel=True)
+    def fit_kernel(x1, y1, x2, y2, center_x, center_y, half):
+        # True if an antenna at some (center_x[i], center_y[i]) has center + 4 corners inside
+        offset_x = np.array([0.0, -half, half, -half, half])
+        offset_y = np.array([0.0, -half, -half, half, half])
+        n = center_x.shape[0]
+        for start in range(0, n, 256):
+            hits = 0
+            for i in prange(start, min(start + 256, n)):
+                fits = True
+                for c in range(5):
+                    px = center_x[i] + offset_x[c]
+                    py = center_y[i] + offset_y[c]
+                    # Scalar ray cast against all edges
+                    inside = False
+                    for k in range(x1.shape[0]):
+                        if (y1[k] > py) != (y2[k] > py):
+                            if px < x1[k] + (x2[k] - x1[k]) * (py - y1[k]) / (y2[k] - y1[k]):
+                                inside = not inside
+                    if not inside:
+                        fits = False
+                        break
+                if fits:
+                    hits += 1
+            if hits > 0:
+                return True
+        return False
+    
+    return fit_kernel
+
 class GNDValidator:
-    """Validates ground plane geometry"""
-    def __init__(self, geometry):
+    """Validates ground plane geometry
+    
+    profile 'full' runs every check; 'quick' skips the antenna fit grid
+    search and only checks the bounding box against the antenna size.
+    """
+    PROFILES = ('quick', 'full')
+    
+    def __init__(self, geometry, profile='full'):
+        if profile not in self.PROFILES:
+            raise ValueError(f"Unknown validation profile: {profile}")
         self.geometry = geometry
+        self.profile = profile
         self.errors = []
         self.warnings = []
         self.suggestions = []
+        self._vertex_array = None  # (N, 3) float array, built on first use
+        self._edge_coords = None  # (x1, y1, x2, y2) arrays, built on first use
     
     def is_valid(self):
         """Run all validation checks"""
@@ -32,13 +96,9 @@ class GNDValidator:
             return
         
         # Calculate bounding box
-        x_coords = [v[0] for v in self.geometry.vertices]
-        y_coords = [v[1] for v in self.geometry.vertices]
-        
-        min_x = min(x_coords)
-        max_x = max(x_coords)
-        min_y = min(y_coords)
-        max_y = max(y_coords)
+        coords = self._get_vertex_array()
+        min_x, min_y = coords[:, :2].min(axis=0).tolist()
+        max_x, max_y = coords[:, :2].max(axis=0).tolist()
         
         width = max_x - min_x
         height = max_y - min_y
@@ -57,7 +117,7 @@ class GNDValidator:
         
         # Second check: verify there's actually a space where 25x25mm antenna can fit
         # Use point-in-polygon test to check if antenna can fit anywhere
-        if self.geometry.edges and len(self.geometry.edges) > 0:
+        if self.profile == 'full' and self.geometry.edges and len(self.geometry.edges) > 0:
             can_fit = self._test_antenna_fit(antenna_size, min_x, max_x, min_y, max_y)
             if not can_fit:
                 self.errors.append(
@@ -71,68 +131,121 @@ class GNDValidator:
         """Test if antenna can fit anywhere in the geometry using grid search"""
         half_antenna = antenna_size / 2
         step = 5  # Test every 5mm
+        coarse_stride = 5  # Coarse pass tests every 25mm first
         
-        # Grid search for valid position
-        y = min_y + half_antenna
-        while y <= max_y - half_antenna:
-            x = min_x + half_antenna
-            while x <= max_x - half_antenna:
-                # Check if antenna at this position fits (center + 4 corners must be inside)
-                test_points = [
-                    (x, y),  # Center
-                    (x - half_antenna, y - half_antenna),  # Bottom-left
-                    (x + half_antenna, y - half_antenna),  # Bottom-right
-                    (x - half_antenna, y + half_antenna),  # Top-left
-                    (x + half_antenna, y + half_antenna)   # Top-right
-                ]
-                
-                if all(self._point_in_polygon(px, py) for px, py in test_points):
-                    return True  # Found a valid position
-                
-                x += step
-            y += step
+        # Grid of candidate antenna centers
+        xs = self._grid_positions(min_x + half_antenna, max_x - half_antenna, step)
+        ys = self._grid_positions(min_y + half_antenna, max_y - half_antenna, step)
+        if not xs or not ys:
+            return False
+        
+        center_x, center_y = np.meshgrid(xs, ys)
+        
+        # Coarse-to-fine: a solid area is usually found on the coarse grid,
+        # otherwise the remaining fine positions are tested as well
+        coarse = np.zeros(center_x.shape, dtype=bool)
+        coarse[::coarse_stride, ::coarse_stride] = True
+        for selection in (coarse, ~coarse):
+            if self._any_position_fits(center_x[selection], center_y[selection], half_antenna):
+                return True  # Found a valid position
         
         return False  # No valid position found
     
-    def _point_in_polygon(self, px, py):
-        """Ray casting algorithm for point-in-polygon test"""
-        if not self.geometry.edges or len(self.geometry.edges) == 0:
-            return True  # If no edges, assume valid
-        
-        inside = False
-        
-        # Test against each edge
-        for edge in self.geometry.edges:
-            if len(edge) < 2:
-                continue
-            
-            start_idx, end_idx = edge[0], edge[1]
-            
-            if start_idx >= len(self.geometry.vertices) or end_idx >= len(self.geometry.vertices):
-                continue
-            
-            v1 = self.geometry.vertices[start_idx]
-            v2 = self.geometry.vertices[end_idx]
-            
-            x1, y1 = float(v1[0]), float(v1[1])
-            x2, y2 = float(v2[0]), float(v2[1])
-            
-            # Ray casting: horizontal ray from (px, py) to the right
-            if (y1 > py) != (y2 > py):
-                # Edge crosses the horizontal line at py
-                intersect_x = x1 + (x2 - x1) * (py - y1) / (y2 - y1)
-                if px < intersect_x:
-                    inside = not inside
-        
-        return inside
+    def _any_position_fits(self, center_x, center_y, half_antenna):
+        """Check whether the antenna fits at any of the given centers"""
+        if len(center_x) == 0:
+            return False
+        
+        # Very large edge counts: native loop without (points x edges) temporaries
+        x1, y1, x2, y2 = self._get_edge_coords()
+        if len(x1) >= _NUMBA_MIN_EDGES and _fit_kernel() is not None:
+            try:
+                return bool(_fit_kernel()(x1, y1, x2, y2, center_x, center_y, half_antenna))
+            except Exception:
+                pass  # e.g. stale compile cache, use the NumPy path below
+        
+        # Antenna at a position fits if center + 4 corners are inside
+        offsets = np.array([
+            (0, 0),                          # Center
+            (-half_antenna, -half_antenna),  # Bottom-left
+            (half_antenna, -half_antenna),   # Bottom-right
+            (-half_antenna, half_antenna),   # Top-left
+            (half_antenna, half_antenna)     # Top-right
+        ])
+        
+        # Test centers in batches to bound the size of the (points x edges) arrays
+        edge_count = max(len(x1), 1)
+        batch = max(1, _MAX_BATCH_ELEMENTS // (len(offsets) * edge_count))
+        for start in range(0, len(center_x), batch):
+            px = (center_x[start:start + batch, None] + offsets[:, 0]).ravel()
+            py = (center_y[start:start + batch, None] + offsets[:, 1]).ravel()
+            inside = self._points_in_polygon(px, py).reshape(-1, len(offsets))
+            if inside.all(axis=1).any():
+                return True
+        
+        return False
+    
+    @staticmethod
+    def _grid_positions(start, stop, step):
+        """Positions start, start + step, ... up to and including stop"""
+        positions = []
+        value = start
+        while value <= stop:
+            positions.append(value)
+            value += step
+        return positions
+    
+    def _get_vertex_array(self):
+        """Vertex coordinates as an (N, 3) array, missing Z as 0 (computed once)"""
+        if self._vertex_array is None:
+            coords = np.asarray(self.geometry.vertices, dtype=np.float64)
+            if coords.ndim != 2:
+                coords = coords.reshape(-1, 3)  # No vertices
+            if coords.shape[1] < 3:
+                coords = np.pad(coords, ((0, 0), (0, 3 - coords.shape[1])))
+            self._vertex_array = coords[:, :3]
+        return self._vertex_array
+    
+    def _get_edge_coords(self):
+        """Endpoint coordinate arrays of all usable edges (computed once)"""
+        if self._edge_coords is None:
+            vertex_count = len(self.geometry.vertices)
+            pairs = [
+                (edge[0], edge[1]) for edge in self.geometry.edges
+                if len(edge) >= 2 and edge[0] < vertex_count and edge[1] < vertex_count
+            ]
+            if pairs:
+                xy = self._get_vertex_array()
+                idx = np.asarray(pairs, dtype=np.int64)
+                start, end = xy[idx[:, 0]], xy[idx[:, 1]]
+                # Contiguous copies: the compiled kernel is much slower on strided views
+                self._edge_coords = tuple(np.ascontiguousarray(column) for column in
+                                          (start[:, 0], start[:, 1], end[:, 0], end[:, 1]))
+            else:
+                empty = np.empty(0, dtype=np.float64)
+                self._edge_coords = (empty, empty, empty, empty)
+        return self._edge_coords
+    
+    def _points_in_polygon(self, px, py):
+        """Ray casting for arrays of points, returns a boolean array"""
+        x1, y1, x2, y2 = self._get_edge_coords()
+        px = np.asarray(px, dtype=np.float64)[:, None]
+        py = np.asarray(py, dtype=np.float64)[:, None]
+        
+        crosses = (y1 > py) != (y2 > py)
+        # Horizontal edges never cross, their (inf/nan) intercepts are masked out
+        with np.errstate(divide='ignore', invalid='ignore'):
+            intersect_x = x1 + (x2 - x1) * (py - y1) / (y2 - y1)
+        
+        return (np.count_nonzero(crosses & (px < intersect_x), axis=1) & 1).astype(bool)
     
     def _check_planar_geometry(self):
         """Check if geometry is mostly planar (for 2D GND)"""
         if not self.geometry.vertices:
             return
         
-        z_coords = [v[2] if len(v) > 2 else 0 for v in self.geometry.vertices]
-        z_variation = max(z_coords) - min(z_coords)
+        z_coords = self._get_vertex_array()[:, 2]
+        z_variation = float(z_coords.max() - z_coords.min())
         
         if z_variation > 5:  # More than 5mm variation
             self.suggestions.append(
@@ -149,18 +262,15 @@ class GNDValidator:
             self.warnings.append("No edges or faces defined in geometry")
             return
         
-        # Build edge connectivity map
-        edge_count = {}
-        for edge in self.geometry.edges:
-            for vertex_idx in edge:
-                edge_count[vertex_idx] = edge_count.get(vertex_idx, 0) + 1
+        # Count edges per vertex
+        edge_count = np.bincount(np.asarray(self.geometry.edges, dtype=np.int64).ravel())
         
         # Check for vertices with odd edge count (open boundaries)
-        open_vertices = [v for v, count in edge_count.items() if count % 2 != 0]
+        open_vertices = int(np.count_nonzero(edge_count & 1))
         
-        if open_vertices and len(open_vertices) > 2:
+        if open_vertices > 2:
             self.warnings.append(
-                f"Geometry has {len(open_vertices)} open boundary vertices. "
+                f"Geometry has {open_vertices} open boundary vertices. "
                 "Consider closing the boundaries for better HFSS simulation."
             )
     
@@ -6,12 +6,262 @@ Manages CSV to Excel integration for S11, AR, and Gain data across iterations.
 
 import os
 import sys
+import numpy as np
 import pandas as pd
 import argparse
+import io
 import json
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from openpyxl import Workbook, load_workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl import Workbook
+from results_io import (
+    SHEET_NS, append_sheet_rows, arrow_read_csv, detect_columns, find_columns,
+    sheet_parts, write_finite
+)
+
+try:
+    import orjson
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# Sidecar recording which CSVs the workbook was built from
+_INDEX_FILE_NAME = '.integrated_index.json'
+_INDEX_VERSION = 1
+
+# Iterations read per tile - only one tile of rows per sheet is held in memory
+_ITERATION_TILE = 64
+
+# Below this many CSV files, worker start-up costs more than parallel parsing saves
+_PARALLEL_MIN_FILES = 64
+
+_ROW_TAG = f'{{{SHEET_NS}}}row'
+_CELL_TAG = f'{{{SHEET_NS}}}c'
+_VALUE_TAG = f'{{{SHEET_NS}}}v'
+_CELL_REF_RE = re.compile(r'([A-Z]+)(\d+)$')
+_CELL_REF_BYTES_RE = re.compile(rb'<c\b[^>]*?\br="([A-Z]+)(\d+)"')
+_CELL_START_RE = re.compile(rb'<c[\s>/]')
+
+def _column_index(letters):
+    """Return the one-based column index for Excel column letters."""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+def _scan_sheet(archive, part, last_scanned_row=100):
+    """Read one worksheet part without building cell objects.
+    
+    Returns (max_row, max_column, values) where values holds the numeric
+    first-column values of rows 2..last_scanned_row, matching what openpyxl's
+    max_row/max_column and iter_rows report for the same sheet.
+    """
+    data = archive.read(part)
+    
+    # When every cell carries its reference (Excel, openpyxl and xlsxwriter all
+    # write one) the sheet extents come from a byte scan and only the first rows
+    # need parsing; otherwise the whole part is parsed
+    refs = _CELL_REF_BYTES_RE.findall(data)
+    full_scan = len(refs) != len(_CELL_START_RE.findall(data))
+    
+    max_row = 0
+    max_column = 0
+    values = []
+    row_number = 0
+    column_number = 0
+    
+    for event, elem in ET.iterparse(io.BytesIO(data), events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == _ROW_TAG:
+                ref = elem.get('r')
+                row_number = int(ref) if ref else row_number + 1
+                if row_number > last_scanned_row and not full_scan:
+                    break
+                column_number = 0
+            continue
+        
+        if elem.tag == _CELL_TAG:
+            match = _CELL_REF_RE.match(elem.get('r') or '')
+            column_number = _column_index(match.group(1)) if match else column_number + 1
+            max_row = max(max_row, row_number)
+            max_column = max(max_column, column_number)
+            
+            if column_number == 1 and 2 <= row_number <= last_scanned_row:
+                value = elem.find(_VALUE_TAG)
+                if value is not None and value.text and elem.get('t', 'n') in ('n', 'b'):
+                    try:
+                        values.append(float(value.text))
+                    except ValueError:
+                        pass
+        elif elem.tag == _ROW_TAG:
+            elem.clear()
+    
+    if refs and not full_scan:
+        max_row = max(int(row) for _, row in refs)
+        max_column = max(_column_index(letters.decode()) for letters in {letters for letters, _ in refs})
+    
+    # openpyxl reports an empty sheet as a single (empty) cell
+    return max(max_row, 1), max(max_column, 1), values
+
+def _read_csv_frame(filepath, columns=None):
+    """Read CSV file with pandas and standardize column names.
+    
+    columns is an optional (freq_col, value_col) pair detected from another file
+    of the same data type; only those columns are parsed, falling back to
+    per-file detection if this file differs. Returns (DataFrame or None,
+    message or None). Kept at module level so that worker processes can run it.
+    """
+    if columns is not None:
+        try:
+            df = pd.read_csv(filepath, usecols=list(columns), engine='c')
+            return df[list(columns)].set_axis(['Frequency_GHz', 'Value'], axis=1), None
+        except Exception:
+            pass
+    
+    try:
+        df = pd.read_csv(filepath, engine='c')
+        
+        # Detect and standardize column names
+        freq_col, value_col = find_columns(df.columns)
+        
+        if freq_col is None or value_col is None:
+            return None, f"[WARNING] Could not identify columns in {filepath}"
+        
+        # Standardize column names
+        df = df.rename(columns={freq_col: 'Frequency_GHz', value_col: 'Value'})
+        return df[['Frequency_GHz', 'Value']], None
+        
+    except Exception as e:
+        return None, f"[ERROR] Error reading {filepath}: {str(e)}"
+
+def _read_csv_table(filepath, columns=None):
+    """Read CSV file into an Arrow table with standardized column names.
+    
+    Takes and returns the same as _read_csv_frame, with an Arrow table in
+    place of the DataFrame.
+    """
+    if columns is not None:
+        try:
+            table = arrow_read_csv(filepath, pa_csv.ConvertOptions(include_columns=list(columns)))
+            return table.rename_columns(['Frequency_GHz', 'Value']), None
+        except Exception:
+            pass
+    
+    try:
+        table = arrow_read_csv(filepath)
+        
+        freq_col, value_col = find_columns(table.column_names)
+        
+        if freq_col is None or value_col is None:
+            return None, f"[WARNING] Could not identify columns in {filepath}"
+        
+        return table.select([freq_col, value_col]).rename_columns(['Frequency_GHz', 'Value']), None
+        
+    except Exception as e:
+        return None, f"[ERROR] Error reading {filepath}: {str(e)}"
+
+def _open_parse_pool(file_count):
+    """Start a process pool for CSV parsing, or return None when it would not pay off."""
+    workers = os.cpu_count() or 1
+    if file_count < _PARALLEL_MIN_FILES or workers < 2:
+        return None
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError):
+        return None
+
+def _sort_rows(df):
+    """Sort combined rows by (Iteration, Frequency_GHz), skipping the sort when already ordered.
+    
+    Files are combined in iteration order and HFSS exports ascending sweeps, so the
+    rows are normally sorted already; one linear check replaces the full sort.
+    """
+    iterations = df['Iteration'].to_numpy()
+    frequencies = df['Frequency_GHz'].to_numpy()
+    try:
+        same = iterations[1:] == iterations[:-1]
+        ordered = (iterations[1:] > iterations[:-1]) | (same & (frequencies[1:] >= frequencies[:-1]))
+        if ordered.all():
+            return df
+    except TypeError:
+        # Mixed-type frequency column - leave the ordering to pandas
+        pass
+    return df.sort_values(['Iteration', 'Frequency_GHz'])
+
+class _StreamingWorkbook:
+    """Row-streaming XLSX writer.
+
+    Uses xlsxwriter in constant_memory mode when it is installed (each row is
+    flushed to disk as soon as the next one starts) and falls back to an
+    openpyxl write-only workbook. Rows must be written in ascending order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._sheets = {}
+        self._next_row = {}
+        if xlsxwriter is not None:
+            self._workbook = xlsxwriter.Workbook(str(path), {
+                'constant_memory': True,
+                'strings_to_numbers': False,
+                'nan_inf_to_errors': True
+            })
+        else:
+            self._workbook = Workbook(write_only=True)
+
+    def add_sheet(self, title, headers):
+        """Create a worksheet and write its header row."""
+        if xlsxwriter is not None:
+            worksheet = self._workbook.add_worksheet(title)
+            worksheet.add_write_handler(float, write_finite)
+            worksheet.add_write_handler(np.float64, write_finite)
+            worksheet.write_row(0, 0, headers)
+        else:
+            worksheet = self._workbook.create_sheet(title=title)
+            worksheet.append(headers)
+        self._sheets[title] = worksheet
+        self._next_row[title] = 1
+
+    def write_rows(self, title, rows):
+        """Append an iterable of row tuples to a worksheet."""
+        worksheet = self._sheets[title]
+        if xlsxwriter is not None:
+            write_row = worksheet.write_row
+            next_row = self._next_row[title]
+            for row in rows:
+                write_row(next_row, 0, row)
+                next_row += 1
+            self._next_row[title] = next_row
+        else:
+            append = worksheet.append
+            for row in rows:
+                append(row)
+
+    def close(self):
+        """Finish writing the file."""
+        if xlsxwriter is not None:
+            self._workbook.close()
+        else:
+            self._workbook.save(self.path)
 
 class IntegratedResultsManager:
     def __init__(self, project_path, excel_path=None):
@@ -19,6 +269,9 @@ class IntegratedResultsManager:
         self.project_path = Path(project_path)
         self.excel_path = Path(excel_path) if excel_path else self.project_path / "Integrated_Results.xlsx"
         self.optimization_data_path = self.project_path / "Optimization" / "data"
+        self.index_path = self.optimization_data_path / _INDEX_FILE_NAME
+        # (freq_col, value_col) detected per data type
+        self._col_map = {}
         
         # Data type patterns for file detection
         self.data_patterns = {
@@ -26,150 +279,378 @@ class IntegratedResultsManager:
             'AR': {'pattern': r'AR_(\d+)\.csv', 'sheet': 'AR_Data', 'value_col': 'AR'},
             'Gain': {'pattern': r'Gain_(\d+)\.csv', 'sheet': 'Gain_Data', 'value_col': 'Gain_dBi'}
         }
+        # Sheet header (and combined DataFrame columns) per data type
+        self._headers = {
+            data_type: ['Iteration', 'Frequency_GHz', config['value_col']]
+            for data_type, config in self.data_patterns.items()
+        }
+        # One pass over the directory classifies every data type at once
+        self._combined_re = re.compile(
+            r'^(' + '|'.join(re.escape(data_type) for data_type in self.data_patterns) + r')_(\d+)\.csv$')
 
     def scan_csv_files(self):
         """Scan for CSV files in the optimization data directory."""
-        import re
-        
         if not self.optimization_data_path.exists():
             print(f"   Optimization data path not found: {self.optimization_data_path}")
             return {}
         
-        csv_files = {}
+        csv_files = {data_type: [] for data_type in self.data_patterns}
         
-        for data_type, config in self.data_patterns.items():
-            csv_files[data_type] = []
-            pattern = re.compile(config['pattern'])
-            
-            for file_path in self.optimization_data_path.glob("*.csv"):
-                match = pattern.match(file_path.name)
-                if match:
-                    iteration = int(match.group(1))
-                    csv_files[data_type].append({
-                        'filepath': file_path,
-                        'filename': file_path.name,
-                        'iteration': iteration
+        with os.scandir(self.optimization_data_path) as entries:
+            for entry in entries:
+                match = self._combined_re.match(entry.name)
+                if match and entry.is_file():
+                    csv_files[match.group(1)].append({
+                        'filepath': Path(entry.path),
+                        'filename': entry.name,
+                        'iteration': int(match.group(2))
                     })
-            
-            # Sort by iteration number
-            csv_files[data_type].sort(key=lambda x: x['iteration'])
+        
+        # Sort by iteration number
+        for files in csv_files.values():
+            files.sort(key=itemgetter('iteration'))
         
         return csv_files
 
     def read_csv_file(self, filepath):
         """Read CSV file and standardize column names."""
+        df, message = _read_csv_frame(filepath)
+        if message:
+            print(message)
+        return df
+
+    def read_csv_table(self, filepath):
+        """Read CSV file into an Arrow table with standardized column names."""
+        table, message = _read_csv_table(filepath)
+        if message:
+            print(message)
+        return table
+
+    def _combine_files(self, data_type, files, row_counts=None, pool=None):
+        """Read CSV files of one data type into a single DataFrame.
+        
+        When row_counts is given, it receives the number of rows read per file name.
+        When pool is given, the files are parsed by its worker processes.
+        """
+        value_col_name = self.data_patterns[data_type]['value_col']
+        columns = self._headers[data_type]
+        
+        # All iterations of a data type share one export layout - detect its
+        # columns once and parse only those from every file
+        source_columns = self._col_map.get(data_type)
+        if source_columns is None:
+            for file_info in files:
+                source_columns = detect_columns(file_info['filepath'])
+                if source_columns is not None:
+                    self._col_map[data_type] = source_columns
+                    break
+        
+        reader = _read_csv_table if pa is not None else _read_csv_frame
+        paths = [file_info['filepath'] for file_info in files]
+        if pool is not None:
+            results = pool.map(reader, paths, repeat(source_columns), chunksize=8)
+        else:
+            results = map(reader, paths, repeat(source_columns))
+        
+        parsed = []
+        for file_info, (data, message) in zip(files, results):
+            if message:
+                print(message)
+            if data is None:
+                continue
+            if row_counts is not None:
+                row_counts[file_info['filename']] = len(data)
+            print(f"[OK] Processed {file_info['filename']}: {len(data)} rows")
+            parsed.append((file_info['iteration'], data))
+        
+        if not parsed:
+            return None
+        
+        if pa is not None:
+            # Concatenate Arrow tables and convert once at the end
+            tables = []
+            for iteration, table in parsed:
+                iteration = pa.array(np.full(table.num_rows, iteration, dtype=np.int32))
+                tables.append(table.add_column(0, 'Iteration', iteration).rename_columns(columns))
+            try:
+                return pa.concat_tables(tables, promote_options='permissive').to_pandas()
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Non-numeric cells in some file - let pandas mix the types
+                return pd.concat([table.to_pandas() for table in tables], ignore_index=True)
+        
+        combined_data = []
+        for iteration, df in parsed:
+            df['Iteration'] = np.int32(iteration)
+            df = df.rename(columns={'Value': value_col_name})
+            combined_data.append(df[columns])
+        return pd.concat(combined_data, ignore_index=True)
+
+    def _load_index(self):
+        """Load the CSV index if it still describes the current Excel file."""
         try:
-            df = pd.read_csv(filepath)
-            
-            # Detect and standardize column names
-            freq_col = None
-            value_col = None
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            st = os.stat(self.excel_path)
+        except (OSError, ValueError):
+            return None
+        
+        if (index.get('version') != _INDEX_VERSION or
+                index.get('excel_path') != str(self.excel_path) or
+                index.get('excel') != [st.st_mtime_ns, st.st_size]):
+            return None
+        return index
+
+    def _save_index(self, csv_files, row_counts, known_files=None):
+        """Record the CSVs (and rows read from each) that the Excel file was built from.
+        
+        known_files holds index entries that are still valid and kept as they are;
+        only the files in csv_files are stat'ed.
+        """
+        if not self.optimization_data_path.exists():
+            return
+        
+        files = {data_type: dict(entries) for data_type, entries in (known_files or {}).items()}
+        for data_type, file_list in csv_files.items():
+            counts = row_counts.get(data_type, {})
+            entries = files.setdefault(data_type, {})
+            for file_info in file_list:
+                try:
+                    st = os.stat(file_info['filepath'])
+                except OSError:
+                    continue
+                entries[file_info['filename']] = [
+                    file_info['iteration'], st.st_mtime_ns, st.st_size,
+                    counts.get(file_info['filename'], 0)
+                ]
+        
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        try:
+            st = os.stat(self.excel_path)
+            index = {
+                'version': _INDEX_VERSION,
+                'excel_path': str(self.excel_path),
+                'excel': [st.st_mtime_ns, st.st_size],
+                'files': files
+            }
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"[WARNING] Could not write CSV index: {str(e)}")
+
+    def _find_new_files(self, csv_files, index):
+        """Return the CSVs added since the index was written, or None if a rebuild is needed.
+        
+        Only files for iterations after the last indexed one can be appended; changed,
+        removed or out-of-order files require rebuilding the workbook.
+        """
+        new_files = {}
+        
+        for data_type, files in csv_files.items():
+            known = index['files'].get(data_type, {})
+            last_iteration = max((entry[0] for entry in known.values()), default=None)
+            unchanged = 0
             
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'freq' in col_lower:
-                    freq_col = col
-                elif any(keyword in col_lower for keyword in ['s(1,1)', 's11', 'ar', 'gain', 'db(']):
-                    value_col = col
+            for file_info in files:
+                entry = known.get(file_info['filename'])
+                if entry is None:
+                    if last_iteration is not None and file_info['iteration'] <= last_iteration:
+                        return None
+                    new_files.setdefault(data_type, []).append(file_info)
+                    continue
+                st = os.stat(file_info['filepath'])
+                if entry[1:3] != [st.st_mtime_ns, st.st_size]:
+                    return None
+                unchanged += 1
             
-            if freq_col is None or value_col is None:
-                print(f"[WARNING] Could not identify columns in {filepath}")
+            if unchanged != len(known):
                 return None
+        
+        return new_files
+
+    def _find_iteration_files(self, index, iteration):
+        """Return one iteration's CSVs missing from the index, or None if a rebuild is needed.
+        
+        Only that iteration's files are looked at; all other files are taken to be
+        as the index recorded them.
+        """
+        new_files = {}
+        
+        for data_type in self.data_patterns:
+            known = index['files'].get(data_type, {})
+            filename = f'{data_type}_{iteration}.csv'
+            filepath = self.optimization_data_path / filename
+            entry = known.get(filename)
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                if entry is not None:
+                    return None
+                continue
             
-            # Standardize column names
-            df = df.rename(columns={freq_col: 'Frequency_GHz', value_col: 'Value'})
-            return df[['Frequency_GHz', 'Value']]
-            
-        except Exception as e:
-            print(f"[ERROR] Error reading {filepath}: {str(e)}")
-            return None
+            if entry is not None:
+                if entry[1:3] != [st.st_mtime_ns, st.st_size]:
+                    return None
+                continue
+            last_iteration = max((entry[0] for entry in known.values()), default=None)
+            if last_iteration is not None and iteration <= last_iteration:
+                return None
+            new_files[data_type] = [{'filepath': filepath, 'filename': filename, 'iteration': iteration}]
+        
+        return new_files
 
     def create_integrated_excel(self):
         """Create integrated Excel file from all CSV files."""
+        # Streaming workbooks cannot be reopened, so the file is always rebuilt
+        # next to the target and swapped in once complete
+        tmp_path = self.excel_path.with_name(self.excel_path.name + '.tmp')
         try:
             csv_files = self.scan_csv_files()
             
-            # Create workbook regardless of CSV files availability
             if self.excel_path.exists():
-                print(f"   Loading existing Excel file: {self.excel_path}")
-                workbook = load_workbook(self.excel_path)
-                # Clear existing sheets
-                for sheet_name in list(workbook.sheetnames):
-                    del workbook[sheet_name]
+                print(f"   Replacing existing Excel file: {self.excel_path}")
             else:
                 print(f"   Creating new Excel file: {self.excel_path}")
-                workbook = Workbook()
-                # Remove default sheet
-                workbook.remove(workbook.active)
+            workbook = _StreamingWorkbook(tmp_path)
             
             if not any(csv_files.values()):
                 print("   No CSV files found - creating empty Excel with basic structure")
                 # Create empty sheets with headers for each data type
                 for data_type, config in self.data_patterns.items():
                     sheet_name = config['sheet']
-                    value_col_name = config['value_col']
                     
                     # Create worksheet with headers
-                    worksheet = workbook.create_sheet(title=sheet_name)
-                    headers = ['Iteration', 'Frequency_GHz', value_col_name]
-                    worksheet.append(headers)
+                    workbook.add_sheet(sheet_name, self._headers[data_type])
                     print(f"   Created empty sheet '{sheet_name}' with headers")
                 
                 # Save empty workbook
-                workbook.save(self.excel_path)
+                workbook.close()
+                os.replace(tmp_path, self.excel_path)
+                self._save_index(csv_files, {})
                 print(f"   Empty integrated Excel file created: {self.excel_path}")
                 return True
             
-            # Process each data type (workbook already created above)
-            for data_type, files in csv_files.items():
-                if not files:
-                    continue
-                
-                sheet_name = self.data_patterns[data_type]['sheet']
-                value_col_name = self.data_patterns[data_type]['value_col']
-                
-                # Combine all iterations for this data type
-                combined_data = []
-                
-                for file_info in files:
-                    df = self.read_csv_file(file_info['filepath'])
-                    if df is not None:
-                        df['Iteration'] = file_info['iteration']
-                        df = df.rename(columns={'Value': value_col_name})
-                        df = df[['Iteration', 'Frequency_GHz', value_col_name]]
-                        combined_data.append(df)
-                        print(f"[OK] Processed {file_info['filename']}: {len(df)} rows")
-                
-                if combined_data:
-                    combined_df = pd.concat(combined_data, ignore_index=True)
-                    combined_df = combined_df.sort_values(['Iteration', 'Frequency_GHz'])
-                    
-                    # Create worksheet
-                    worksheet = workbook.create_sheet(title=sheet_name)
-                    
-                    # Write data to worksheet
-                    for row in dataframe_to_rows(combined_df, index=False, header=True):
-                        worksheet.append(row)
+            # Walk the iterations tile by tile, writing each data type's rows for the
+            # tile to its sheet before moving on
+            cursors = {data_type: 0 for data_type in csv_files}
+            total_rows = {}
+            row_counts = {data_type: {} for data_type in csv_files}
+            
+            pool = _open_parse_pool(sum(len(files) for files in csv_files.values()))
+            try:
+                while True:
+                    pending = [files[cursors[data_type]]['iteration']
+                               for data_type, files in csv_files.items() if cursors[data_type] < len(files)]
+                    if not pending:
+                        break
+                    tile_end = min(pending) + _ITERATION_TILE
                     
-                    print(f"   Created sheet '{sheet_name}' with {len(combined_df)} total rows")
+                    for data_type, files in csv_files.items():
+                        start = cursors[data_type]
+                        stop = start
+                        while stop < len(files) and files[stop]['iteration'] < tile_end:
+                            stop += 1
+                        cursors[data_type] = stop
+                        if stop == start:
+                            continue
+                        
+                        sheet_name = self.data_patterns[data_type]['sheet']
+                        
+                        # Combine the tile's iterations for this data type
+                        tile_df = self._combine_files(data_type, files[start:stop],
+                                                      row_counts[data_type], pool)
+                        if tile_df is None:
+                            continue
+                        tile_df = _sort_rows(tile_df)
+                        
+                        # Create the worksheet on its first rows, then stream rows into it
+                        if data_type not in total_rows:
+                            workbook.add_sheet(sheet_name, self._headers[data_type])
+                            total_rows[data_type] = 0
+                        workbook.write_rows(sheet_name, tile_df.itertuples(index=False, name=None))
+                        total_rows[data_type] += len(tile_df)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+            
+            for data_type, rows in total_rows.items():
+                print(f"   Created sheet '{self.data_patterns[data_type]['sheet']}' with {rows} total rows")
             
             # Save workbook
-            workbook.save(self.excel_path)
+            workbook.close()
+            os.replace(tmp_path, self.excel_path)
+            self._save_index(csv_files, row_counts)
             print(f"   Integrated Excel file saved: {self.excel_path}")
             return True
             
         except Exception as e:
             print(f"[ERROR] Error creating integrated Excel: {str(e)}")
+            if tmp_path.exists():
+                tmp_path.unlink()
             return False
 
     def update_integrated_excel(self, iteration=None):
-        """Update integrated Excel file with new data."""
-        # For now, just recreate the entire file
-        return self.create_integrated_excel()
+        """Update integrated Excel file with new data.
+        
+        Appends only the CSVs added since the last create/update; anything else
+        (missing index, changed or removed files) falls back to a full rebuild.
+        With an iteration, only that iteration's CSVs are checked and appended.
+        """
+        index = self._load_index()
+        if index is None:
+            print("   No valid CSV index - rebuilding integrated Excel file")
+            return self.create_integrated_excel()
+        
+        tmp_path = self.excel_path.with_name(self.excel_path.name + '.tmp')
+        try:
+            if iteration is not None:
+                new_files = self._find_iteration_files(index, iteration)
+            else:
+                new_files = self._find_new_files(self.scan_csv_files(), index)
+            if new_files is None:
+                print("   CSV files changed since last build - rebuilding integrated Excel file")
+                return self.create_integrated_excel()
+            if not new_files:
+                print("   Integrated Excel file is already up to date")
+                return True
+            
+            print(f"   Appending to existing Excel file: {self.excel_path}")
+            row_counts = {data_type: {name: entry[3] for name, entry in index['files'].get(data_type, {}).items()}
+                          for data_type in self.data_patterns}
+            appends = {}
+            
+            for data_type, files in new_files.items():
+                sheet_name = self.data_patterns[data_type]['sheet']
+                indexed_rows = sum(row_counts[data_type].values())
+                
+                new_df = self._combine_files(data_type, files, row_counts[data_type])
+                if new_df is None:
+                    continue
+                new_df = _sort_rows(new_df)
+                appends[sheet_name] = (indexed_rows, new_df.itertuples(index=False, name=None))
+                print(f"   Appending {len(new_df)} rows to sheet '{sheet_name}'")
+            
+            # Splice the new rows into the affected sheet XML; everything else is copied
+            if appends:
+                if not append_sheet_rows(self.excel_path, tmp_path, appends):
+                    print("   Excel file does not match the CSV index - rebuilding integrated Excel file")
+                    return self.create_integrated_excel()
+                os.replace(tmp_path, self.excel_path)
+            self._save_index(new_files, row_counts, index['files'])
+            print(f"   Integrated Excel file updated: {self.excel_path}")
+            return True
+            
+        except Exception as e:
+            print(f"[ERROR] Error updating integrated Excel: {str(e)}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return False
 
     def clear_integrated_excel(self):
         """Clear/delete the integrated Excel file."""
         try:
+            if self.index_path.exists():
+                self.index_path.unlink()
             if self.excel_path.exists():
                 self.excel_path.unlink()
                 print(f"   Cleared integrated Excel file: {self.excel_path}")
@@ -187,24 +668,20 @@ class IntegratedResultsManager:
             if not self.excel_path.exists():
                 return {"exists": False, "path": str(self.excel_path)}
             
-            workbook = load_workbook(self.excel_path, data_only=True)
             sheets_info = {}
             max_iteration = 0
             
-            for sheet_name in workbook.sheetnames:
-                worksheet = workbook[sheet_name]
-                rows = worksheet.max_row
-                cols = worksheet.max_column
-                sheets_info[sheet_name] = {"rows": rows - 1, "columns": cols}  # -1 for header
-                
-                # Try to find max iteration
-                try:
-                    for row in worksheet.iter_rows(min_row=2, max_row=min(rows, 100), min_col=1, max_col=1):
-                        cell_value = row[0].value
-                        if cell_value and isinstance(cell_value, (int, float)):
+            # Read the sheet XML straight out of the archive - only row counts and
+            # the first iteration values are needed, not a full workbook load
+            with zipfile.ZipFile(self.excel_path) as archive:
+                for sheet_name, part in sheet_parts(archive).items():
+                    rows, cols, iterations = _scan_sheet(archive, part)
+                    sheets_info[sheet_name] = {"rows": rows - 1, "columns": cols}  # -1 for header
+                    
+                    # Try to find max iteration
+                    for cell_value in iterations:
+                        if cell_value:
                             max_iteration = max(max_iteration, int(cell_value))
-                except:
-                    pass
             
             return {
                 "exists": True,
@@ -264,7 +741,9 @@ def main():
     elif args.action == 'summary':
         summary = manager.get_summary()
         # For summary action, output only JSON (no extra text for server parsing)
-        print(json.dumps(summary, indent=2))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_json_dumps(summary) + b'\n')
+        sys.stdout.buffer.flush()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
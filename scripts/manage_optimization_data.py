@@ -13,17 +13,46 @@ Execution order: manage_optimization_data.py → generate_f_model.py
 
 import sys
 import os
+import errno
 import shutil
+import stat
 import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
+
 # Set UTF-8 encoding for console output
 if sys.platform == "win32":
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)): share the source's extents with the destination
+_FICLONE = 0x40049409
+
+# Errors meaning the filesystem (or this pair of paths) cannot clone - stop trying
+_CLONE_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+# Bytes handed to each os.sendfile call when copying F_Model_Element files
+_SENDFILE_CHUNK = 1 << 20
+
+# Removal is bound by per-file syscall latency (network shares, Windows), not bandwidth
+_UNLINK_WORKERS = 32
+_PARALLEL_UNLINK_MIN = 64
+
+# Entries walked in Python before the rest of a tree is handed to GNU find
+_FIND_MIN_ENTRIES = 2048
+
 class OptimizationDataManager:
     """Handles optimization data backup and removal operations"""
     
@@ -45,24 +74,150 @@ class OptimizationDataManager:
             'errors': [],
             'timestamp': datetime.now().isoformat()
         }
+        self._clone_supported = True
+        self._fmodel_files_cache = None
+        self._fmodel_cache_mtime = None
+        # Backup path -> original for F_Model_Element backups that are hardlinks
+        self._linked_fmodel_backups = {}
+        
+    def _windows_copy_file(self, src, dst):
+        """Copy a file with CopyFileExW, raising OSError if it fails
+        
+        CopyFileExW copies data, attributes and timestamps in one call, and lets
+        ReFS / Dev Drive volumes block-clone.
+        """
+        import ctypes
+        if not ctypes.windll.kernel32.CopyFileExW(str(src), str(dst), None, None, None, 0):
+            raise ctypes.WinError()
+        return dst
+    
+    def _reflink_copy(self, src, dst):
+        """Copy a file as a copy-on-write clone where the filesystem supports it
+        
+        Falls back to shutil.copy2 (and stops trying to clone) when it does not.
+        """
+        if self._clone_supported:
+            try:
+                if sys.platform.startswith('linux'):
+                    import fcntl
+                    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                    shutil.copystat(src, dst)
+                    return dst
+                elif sys.platform == 'darwin':
+                    import ctypes
+                    libc = ctypes.CDLL(None, use_errno=True)
+                    # clonefile() copies data and metadata in one call on APFS
+                    if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+                        return dst
+                    raise OSError(ctypes.get_errno(), 'clonefile failed')
+                elif sys.platform == 'win32':
+                    return self._windows_copy_file(src, dst)
+                else:
+                    self._clone_supported = False
+            except (OSError, AttributeError, ImportError) as e:
+                if not isinstance(e, OSError) or e.errno in _CLONE_UNSUPPORTED:
+                    self._clone_supported = False
+        
+        return shutil.copy2(src, dst)
+    
+    def _fast_rmtree(self, path):
+        """Remove a directory tree, unlinking its files from a thread pool
+        
+        Falls back to shutil.rmtree if anything goes wrong.
+        """
+        if os.path.islink(path):
+            # Let shutil.rmtree raise its usual error for symlinked roots
+            shutil.rmtree(path)
+            return
         
+        try:
+            files = []
+            dirs = []
+            for root, dirnames, filenames in os.walk(path, topdown=False):
+                files.extend(os.path.join(root, name) for name in filenames)
+                # Symlinked directories are unlinked, not descended into
+                files.extend(os.path.join(root, name) for name in dirnames
+                             if os.path.islink(os.path.join(root, name)))
+                dirs.append(root)
+            
+            if len(files) >= _PARALLEL_UNLINK_MIN:
+                with ThreadPoolExecutor(max_workers=_UNLINK_WORKERS) as pool:
+                    list(pool.map(os.unlink, files))
+            else:
+                for file_path in files:
+                    os.unlink(file_path)
+            
+            # Bottom-up walk order lists children before their parents
+            for dir_path in dirs:
+                os.rmdir(dir_path)
+        except OSError:
+            shutil.rmtree(path)
+    
+    def _find_directory_stats(self, dir_paths):
+        """Count and size the files under dir_paths with GNU find, or None if it cannot
+        
+        Gives up on symlinks (find would size the link, not its target), on any
+        error, and where find has no -printf, leaving those trees to the scandir walk.
+        """
+        command = ['find'] + [os.path.abspath(path) for path in dir_paths] + [
+            '(', '-type', 'l', '-printf', 'l\\n', '-quit', ')', '-o',
+            '(', '!', '-type', 'd', '-printf', '%s\\n', ')'
+        ]
+        try:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError:
+            return None
+        sizes = result.stdout.split()
+        if result.returncode != 0 or (sizes and sizes[-1] == b'l'):
+            return None
+        return len(sizes), sum(map(int, sizes))
+    
     def get_directory_stats(self, dir_path):
         """Get directory statistics (file count and total size)"""
         total_size = 0
         file_count = 0
-        
-        try:
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        file_stat = os.stat(file_path)
-                        total_size += file_stat.st_size
-                        file_count += 1
-                    except OSError as e:
-                        print(f"Warning: Could not stat file {file_path}: {e}")
-        except OSError as e:
-            print(f"Error accessing directory {dir_path}: {e}")
+        pending = [dir_path]
+        walked = 0
+        use_find = sys.platform.startswith('linux')
+        
+        # os.scandir hands back directory entries with their type (and on Windows
+        # their size) already filled in, saving a syscall per file over os.walk
+        while pending:
+            current = pending.pop()
+            # Totals before this directory, restored if find takes over part-way through it
+            restart = (file_count, total_size, len(pending))
+            found = None
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        walked += 1
+                        if use_find and walked == _FIND_MIN_ENTRIES:
+                            # Past a few thousand entries find's C walk beats per-entry
+                            # Python work by enough to pay for starting it, so small
+                            # trees never start a process
+                            found = self._find_directory_stats([current] + pending[:restart[2]])
+                            if found is not None:
+                                break
+                            use_find = False
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_dir():
+                            # Symlinked directories are not followed
+                            continue
+                        else:
+                            try:
+                                total_size += entry.stat().st_size
+                                file_count += 1
+                            except OSError as e:
+                                print(f"Warning: Could not stat file {entry.path}: {e}")
+            except OSError as e:
+                print(f"Error accessing directory {current}: {e}")
+            
+            if found is not None:
+                file_count = restart[0] + found[0]
+                total_size = restart[1] + found[1]
+                break
             
         return {
             'file_count': file_count,
@@ -70,8 +225,53 @@ class OptimizationDataManager:
             'total_size_mb': round(total_size / (1024 * 1024), 2)
         }
     
+    def _fast_copy(self, src, dst, src_stat):
+        """Copy a file's data, mode and times in the kernel
+        
+        Uses an os.sendfile loop on Linux and CopyFileExW on Windows; src_stat is
+        the caller's os.stat(src), reused instead of statting again.
+        """
+        if sys.platform == 'win32':
+            try:
+                return self._windows_copy_file(src, dst)
+            except OSError:
+                return shutil.copy2(src, dst)
+        
+        if sys.platform.startswith('linux'):
+            try:
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    offset = 0
+                    while True:
+                        sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, _SENDFILE_CHUNK)
+                        if sent == 0:
+                            break
+                        offset += sent
+            except OSError:
+                shutil.copyfile(src, dst)
+        else:
+            shutil.copyfile(src, dst)
+        
+        os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+        os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        return dst
+    
+    def _fmodel_dirs_mtime(self):
+        """Modification times of the directories find_fmodel_files scans"""
+        mtimes = []
+        for dir_path in (self.project_root, self.project_root / 'Function' / 'HFSS'):
+            try:
+                mtimes.append(os.stat(dir_path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+    
     def find_fmodel_files(self):
         """Find ALL F_Model_Element files in project root and Function/HFSS, including backups"""
+        # Reuse the last scan while neither directory has gained or lost entries
+        dirs_mtime = self._fmodel_dirs_mtime()
+        if self._fmodel_files_cache is not None and self._fmodel_cache_mtime == dirs_mtime:
+            return list(self._fmodel_files_cache)
+        
         fmodel_files = []
         
         # Check project root for current and backup files
@@ -106,6 +306,8 @@ class OptimizationDataManager:
             except Exception as e:
                 print(f'⚠️ Warning: Could not scan Function/HFSS directory: {e}')
         
+        self._fmodel_files_cache = list(fmodel_files)
+        self._fmodel_cache_mtime = dirs_mtime
         return fmodel_files
     
     def create_unique_backup_path(self):
@@ -126,8 +328,15 @@ class OptimizationDataManager:
         
         return backup_path
     
-    def backup_optimization_folder(self):
-        """Create backup of optimization folder"""
+    def backup_optimization_folder(self, fmodel_files=None, link_fmodels=False):
+        """Create backup of optimization folder
+        
+        fmodel_files is an optional pre-computed find_fmodel_files() result.
+        With link_fmodels, F_Model_Element files are hardlinked into the backup
+        instead of copied - only safe when the originals are removed right after,
+        since an in-place edit of a linked original would change its backup too
+        (removal swaps in a real copy for any original it fails to delete).
+        """
         if not self.optimization_folder.exists():
             self.results['optimization_exists'] = False
             self.results['message'] = 'No optimization folder found - nothing to backup'
@@ -149,17 +358,34 @@ class OptimizationDataManager:
         try:
             # Copy optimization folder
             print(f'💾 Creating backup: {backup_path}')
-            shutil.copytree(self.optimization_folder, backup_path)
+            shutil.copytree(self.optimization_folder, backup_path, copy_function=self._reflink_copy)
             
             # Backup F_Model_Element files
-            fmodel_files = self.find_fmodel_files()
+            if fmodel_files is None:
+                fmodel_files = self.find_fmodel_files()
             fmodel_backup_info = []
             
             for fmodel_file in fmodel_files:
                 backup_file_path = backup_path / fmodel_file.name
                 try:
-                    shutil.copy2(fmodel_file, backup_file_path)
                     file_stats = os.stat(fmodel_file)
+                    linked = False
+                    # Never link onto a name an earlier file already took
+                    if link_fmodels and not os.path.lexists(backup_file_path):
+                        try:
+                            os.link(fmodel_file, backup_file_path)
+                            linked = True
+                        except (OSError, NotImplementedError):
+                            # Cross-volume backup or FAT
+                            pass
+                    if linked:
+                        self._linked_fmodel_backups[backup_file_path] = fmodel_file
+                    else:
+                        # Drop an earlier file's hardlink first so the copy cannot
+                        # write through it into that live original
+                        if self._linked_fmodel_backups.pop(backup_file_path, None) is not None:
+                            os.unlink(backup_file_path)
+                        self._fast_copy(fmodel_file, backup_file_path, file_stats)
                     fmodel_backup_info.append({
                         'original_path': str(fmodel_file),
                         'backup_path': str(backup_file_path),
@@ -189,15 +415,37 @@ class OptimizationDataManager:
             self.results['errors'].append(error_msg)
             return False
     
-    def remove_optimization_data(self):
-        """Remove optimization folder and F_Model_Element files"""
+    def _unshare_fmodel_backup(self, fmodel_file):
+        """Replace the hardlinked backup of an original that could not be removed
+        
+        The original stays live (and may be rewritten in place), so its backup is
+        swapped for an independent copy.
+        """
+        for backup_file_path, original in list(self._linked_fmodel_backups.items()):
+            if original != fmodel_file:
+                continue
+            try:
+                temp_path = backup_file_path.with_name(backup_file_path.name + '.tmp')
+                self._fast_copy(fmodel_file, temp_path, os.stat(fmodel_file))
+                os.replace(temp_path, backup_file_path)
+                del self._linked_fmodel_backups[backup_file_path]
+            except OSError as e:
+                error_msg = f'Backup {backup_file_path} is still linked to {fmodel_file}: {e}'
+                print(f'⚠️ {error_msg}')
+                self.results['errors'].append(error_msg)
+    
+    def remove_optimization_data(self, fmodel_files=None):
+        """Remove optimization folder and F_Model_Element files
+        
+        fmodel_files is an optional pre-computed find_fmodel_files() result.
+        """
         removed_items = []
         
         # Remove optimization folder
         if self.optimization_folder.exists():
             try:
                 print(f'🗑️ Removing optimization folder: {self.optimization_folder}')
-                shutil.rmtree(self.optimization_folder)
+                self._fast_rmtree(self.optimization_folder)
                 removed_items.append(str(self.optimization_folder))
                 self.results['optimization_removed'] = True
                 print('✅ Optimization folder removed')
@@ -207,7 +455,8 @@ class OptimizationDataManager:
                 self.results['errors'].append(error_msg)
         
         # Remove F_Model_Element files
-        fmodel_files = self.find_fmodel_files()
+        if fmodel_files is None:
+            fmodel_files = self.find_fmodel_files()
         fmodel_removed_count = 0
         
         for fmodel_file in fmodel_files:
@@ -221,6 +470,7 @@ class OptimizationDataManager:
                 error_msg = f'Failed to remove {fmodel_file}: {e}'
                 print(f'⚠️ {error_msg}')
                 self.results['errors'].append(error_msg)
+                self._unshare_fmodel_backup(fmodel_file)
         
         if fmodel_removed_count > 0:
             self.results['fmodel_removed'] = True
@@ -252,8 +502,11 @@ class OptimizationDataManager:
         print('🔄 Starting backup and remove operation...')
         self.results['action'] = 'backup-and-remove'
         
+        # Scan for F_Model_Element files once; backup and removal share the list
+        fmodel_files = self.find_fmodel_files()
+        
         # First backup
-        backup_success = self.backup_optimization_folder()
+        backup_success = self.backup_optimization_folder(fmodel_files, link_fmodels=True)
         
         if not backup_success:
             self.results['message'] = "❌ Failed to create backup - aborting removal for safety"
@@ -264,7 +517,6 @@ class OptimizationDataManager:
         if not self.results['optimization_exists']:
             print('ℹ️ No optimization folder exists, but checking for F_Model files to remove...')
             # Still remove F_Model_Element files for clean start
-            fmodel_files = self.find_fmodel_files()
             fmodel_removed_count = 0
             
             for fmodel_file in fmodel_files:
@@ -277,6 +529,7 @@ class OptimizationDataManager:
                     error_msg = f'Failed to remove {fmodel_file}: {e}'
                     print(f'⚠️ {error_msg}')
                     self.results['errors'].append(error_msg)
+                    self._unshare_fmodel_backup(fmodel_file)
             
             if fmodel_removed_count > 0:
                 self.results['fmodel_removed'] = True
@@ -289,7 +542,7 @@ class OptimizationDataManager:
             return True
         
         # Then remove optimization folder
-        remove_success = self.remove_optimization_data()
+        remove_success = self.remove_optimization_data(fmodel_files)
         
         # Generate final message
         stats = self.results['stats'].get('optimization', {})
@@ -304,6 +557,12 @@ class OptimizationDataManager:
         self.results['success'] = backup_success and (remove_success or not self.results['optimization_exists'])
         return self.results['success']
 
+def emit_json(obj):
+    """Write obj as indented JSON to stdout in a single write"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_json_dumps(obj) + b'\n')
+    sys.stdout.buffer.flush()
+
 def print_usage():
     """Print usage information"""
     print("Usage: python manage_optimization_data.py <action> <project_root>")
@@ -374,7 +633,7 @@ def main():
         # Output JSON for programmatic use
         print()
         print("JSON OUTPUT:")
-        print(json.dumps(manager.results, indent=2))
+        emit_json(manager.results)
         
         sys.exit(0 if success else 1)
         
@@ -389,7 +648,7 @@ def main():
         }
         print()
         print("JSON OUTPUT:")
-        print(json.dumps(error_result, indent=2))
+        emit_json(error_result)
         sys.exit(1)
 
 if __name__ == "__main__":
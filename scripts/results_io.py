@@ -0,0 +1,181 @@
+"""
+Results I/O Helpers
+Shared CSV column detection and XLSX worksheet surgery for the scripts that
+build and update Integrated_Results.xlsx (integrated_results_manager.py and
+update_excel_incremental.py).
+"""
+
+import csv
+import math
+import posixpath
+import re
+import zipfile
+import numpy as np
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+    pa_csv = None
+
+# Substrings identifying the value column of a CSV export (lowercase)
+VALUE_KEYWORDS = ('s(1,1)', 's11', 'ar', 'gain', 'db(')
+
+SHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+LAST_ROW_RE = re.compile(rb'<row\b[^>]*?\br="(\d+)"')
+DIMENSION_RE = re.compile(rb'<dimension ref="([A-Z]+)1(?::([A-Z]+)\d+)?"\s*/>')
+
+
+def find_columns(columns):
+    """Pick the frequency and value columns out of a CSV header; the last match of each wins."""
+    freq_col = None
+    value_col = None
+
+    for col in columns:
+        col_lower = col.lower()
+        if 'freq' in col_lower:
+            freq_col = col
+        elif any(keyword in col_lower for keyword in VALUE_KEYWORDS):
+            value_col = col
+
+    return freq_col, value_col
+
+
+def detect_columns(filepath):
+    """Pick the frequency and value columns from a CSV file's header row alone.
+
+    Returns (freq_col, value_col), or None if they cannot be identified (or the
+    header repeats a name, which the parsers would rename).
+    """
+    try:
+        with open(filepath, 'r', newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f), None)
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return None
+
+    if not header or len(set(header)) != len(header):
+        return None
+    freq_col, value_col = find_columns(header)
+    if freq_col is None or value_col is None:
+        return None
+    return freq_col, value_col
+
+
+def arrow_read_csv(filepath, convert_options=None):
+    """Parse a CSV file with pyarrow, memory-mapping it where possible."""
+    read_options = pa_csv.ReadOptions(use_threads=True)
+    try:
+        # Parse straight out of the page cache
+        with pa.memory_map(str(filepath), 'r') as source:
+            return pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+    except OSError:
+        # Empty files and some network shares cannot be mapped
+        return pa_csv.read_csv(str(filepath), read_options=read_options, convert_options=convert_options)
+
+
+def write_finite(worksheet, row, col, value, *args):
+    """xlsxwriter write handler leaving NaN/inf cells empty, as openpyxl does."""
+    if not math.isfinite(value):
+        return worksheet.write_blank(row, col, None, *args)
+    return None
+
+
+def sheet_parts(archive):
+    """Map sheet names to their worksheet XML part names in an open XLSX archive."""
+    targets = {}
+    for rel in ET.fromstring(archive.read('xl/_rels/workbook.xml.rels')).iter(f'{{{PKG_REL_NS}}}Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            targets[rel.get('Id')] = target[1:]
+        else:
+            targets[rel.get('Id')] = posixpath.normpath(posixpath.join('xl', target))
+
+    parts = {}
+    for sheet in ET.fromstring(archive.read('xl/workbook.xml')).iter(f'{{{SHEET_NS}}}sheet'):
+        parts[sheet.get('name')] = targets[sheet.get(f'{{{REL_NS}}}id')]
+    return parts
+
+
+def column_letter(index):
+    """Return the Excel column letter for a zero-based column index."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def row_xml(row_number, values):
+    """Serialize one row of cell values as worksheet XML."""
+    cells = []
+    for column, value in enumerate(values):
+        ref = f'{column_letter(column)}{row_number}'
+        if value is None:
+            continue
+        if isinstance(value, (bool, np.bool_)):
+            cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, np.integer)):
+            cells.append(f'<c r="{ref}"><v>{int(value)}</v></c>')
+        elif isinstance(value, (float, np.floating)):
+            if math.isfinite(value):
+                cells.append(f'<c r="{ref}"><v>{float(value):.16g}</v></c>')
+        else:
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>')
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+
+def append_sheet_rows(src_path, dst_path, appends):
+    """Copy an XLSX file, appending rows to the end of existing sheets.
+
+    appends maps sheet name -> (expected existing data rows or None, iterable of
+    row tuples). Only the affected worksheet parts are rewritten; everything else
+    (styles included) is copied as is. Returns False without writing anything if
+    a sheet is missing, its rows cannot be located or its row count differs from
+    the expected one.
+    """
+    with zipfile.ZipFile(src_path) as archive:
+        parts = sheet_parts(archive)
+        updated = {}
+
+        for sheet_name, (expected_rows, rows) in appends.items():
+            part = parts.get(sheet_name)
+            if part is None:
+                return False
+            xml = archive.read(part)
+            end = xml.rfind(b'</sheetData>')
+            start = xml.rfind(b'<row ', 0, end)
+            last_row = LAST_ROW_RE.match(xml, start) if end >= 0 and start >= 0 else None
+            if last_row is None:
+                return False
+            row_number = int(last_row.group(1))
+            if expected_rows is not None and row_number - 1 != expected_rows:
+                return False
+
+            width = 0
+            chunks = []
+            for row in rows:
+                row_number += 1
+                width = max(width, len(row))
+                chunks.append(row_xml(row_number, row))
+
+            head = xml[:end]
+            match = DIMENSION_RE.search(head, 0, head.find(b'<sheetData'))
+            if match and width:
+                last_col = match.group(2) or match.group(1)
+                last_col = max(last_col.decode(), column_letter(width - 1), key=lambda c: (len(c), c))
+                dimension = f'<dimension ref="{match.group(1).decode()}1:{last_col}{row_number}"/>'.encode()
+                head = head[:match.start()] + dimension + head[match.end():]
+            updated[part] = b''.join([head, ''.join(chunks).encode('utf-8'), xml[end:]])
+
+        with zipfile.ZipFile(dst_path, 'w', zipfile.ZIP_DEFLATED) as output:
+            for info in archive.infolist():
+                data = updated.get(info.filename)
+                output.writestr(info, data if data is not None else archive.read(info.filename))
+
+    return True
@@ -6,14 +6,150 @@ Checks Excel file, finds missing iterations from CSV files, and appends them.
 
 import os
 import sys
+import json
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from results_io import (
+    LAST_ROW_RE, VALUE_KEYWORDS, append_sheet_rows, arrow_read_csv, detect_columns,
+    find_columns, sheet_parts, write_finite
+)
 import re
 import argparse
 
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pa_csv = pq = None
+
+# Sidecar next to the workbook recording its last iteration (and the workbook
+# mtime/size it was written for), so updates need not scan every sheet
+STATE_FILE_NAME = '.last_iteration.json'
+
+# Parquet dataset next to the workbook (partitioned by data type) that
+# --store parquet appends to; --regenerate-excel rebuilds the workbook from it
+PARQUET_DIR_NAME = 'results.parquet'
+
+# Inside the dataset: the last iteration whose rows are completely written.
+# Dataset readers skip names starting with '_'
+PARQUET_STATE_NAME = '_last_iteration.json'
+
+# Dataset files are named after the iteration range they were written for
+_PARQUET_FILE_RE = re.compile(r'iterations-(\d+)-(\d+)-\d+\.parquet')
+
+# Missing iterations above which a workbook that needs new sheets is rewritten
+# in streaming mode instead of being fully loaded, appended to and saved
+BULK_REWRITE_MIN_ITERATIONS = 20
+
+# Iteration CSV file names of every data type
+_ITERATION_CSV_RE = re.compile(r'(S11|AR|Gain)_(\d+)\.csv')
+
+# Per data type: CSV file name template, target sheet and value column name
+DATA_CONFIGS = {
+    'S11': {'pattern': 'S11_{iteration}.csv', 'sheet': 'S11_Data', 'col': 'S11_dB'},
+    'AR': {'pattern': 'AR_{iteration}.csv', 'sheet': 'AR_Data', 'col': 'AR'},
+    'Gain': {'pattern': 'Gain_{iteration}.csv', 'sheet': 'Gain_Data', 'col': 'Gain_dBi'}
+}
+
+# CSV reads are bound by per-file open/read latency (network shares, virus
+# scanners), so a catch-up overlaps them on a few threads
+_CSV_READ_WORKERS = 8
+_PARALLEL_READ_MIN_ITERATIONS = 8
+
+# From this many missing iterations, parsing is spread over worker processes
+# instead (on multi-core machines); below it, worker start-up costs more
+_PARALLEL_PARSE_MIN_ITERATIONS = 32
+
+_FIRST_CELL_RE = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_COLUMN_A_REF_RE = re.compile(rb'\br="A\d+"')
+_CELL_TYPE_RE = re.compile(rb'\bt="(\w+)"')
+_CELL_VALUE_RE = re.compile(rb'<v>([^<]*)</v>')
+
+def read_iteration_state(excel_path):
+    """Return the last iteration recorded for excel_path, or None if the state is missing or stale."""
+    try:
+        with open(Path(excel_path).with_name(STATE_FILE_NAME), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        st = os.stat(excel_path)
+    except (OSError, ValueError):
+        return None
+    
+    # The workbook may have been rebuilt or edited by something else since
+    if not isinstance(state, dict) or state.get('excel') != [st.st_mtime_ns, st.st_size]:
+        return None
+    last_iteration = state.get('last_iteration')
+    return last_iteration if isinstance(last_iteration, int) else None
+
+def write_iteration_state(excel_path, last_iteration):
+    """Record the workbook's last iteration in the sidecar, replacing it atomically."""
+    state_path = Path(excel_path).with_name(STATE_FILE_NAME)
+    tmp_path = state_path.with_name(state_path.name + '.tmp')
+    try:
+        st = os.stat(excel_path)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'excel': [st.st_mtime_ns, st.st_size], 'last_iteration': last_iteration}, f)
+        os.replace(tmp_path, state_path)
+    except OSError as e:
+        print(f"[WARNING] Could not write iteration state: {e}")
+
+def _last_row_iteration(xml):
+    """Return the iteration in the last row of a worksheet part's XML.
+    
+    0 for a sheet without data rows; None when the last row cannot be read this
+    way (no row references, or no numeric value in column A).
+    """
+    end = xml.rfind(b'</sheetData>')
+    if end < 0:
+        return 0 if b'<sheetData/>' in xml else None
+    
+    start = xml.rfind(b'<row', 0, end)
+    while start >= 0 and xml[start + 4:start + 5] not in (b' ', b'>', b'/'):
+        start = xml.rfind(b'<row', 0, start)
+    if start < 0:
+        return 0
+    
+    row = LAST_ROW_RE.match(xml, start)
+    if row is None:
+        return None
+    if row.group(1) == b'1':
+        return 0
+    
+    # Its first cell has to be a number in column A
+    cell = _FIRST_CELL_RE.search(xml, row.end(), end)
+    if cell is None or not _COLUMN_A_REF_RE.search(cell.group(1)):
+        return None
+    cell_type = _CELL_TYPE_RE.search(cell.group(1))
+    value = _CELL_VALUE_RE.search(cell.group(2) or b"")
+    if value is None or (cell_type is not None and cell_type.group(1) not in (b'n', b'b')):
+        return None
+    try:
+        return int(float(value.group(1)))
+    except ValueError:
+        return None
+
 def get_last_iteration_in_excel(excel_path):
     """Get the highest iteration number currently in Excel."""
+    # Iterations are only ever appended, so every sheet's last row holds its highest
+    # one. Workbooks whose sheet tails cannot be read that way are scanned in full
+    try:
+        with zipfile.ZipFile(excel_path) as archive:
+            last_rows = [_last_row_iteration(archive.read(part)) for part in sheet_parts(archive).values()]
+        if None not in last_rows:
+            return max(last_rows, default=0)
+    except Exception:
+        pass
+    
     try:
         wb = load_workbook(excel_path, read_only=True)
         max_iteration = 0
@@ -33,74 +169,207 @@ def get_last_iteration_in_excel(excel_path):
 
 def find_csv_iterations(data_path, start_iteration):
     """Find all CSV iterations greater than start_iteration."""
-    data_patterns = {
-        'S11': r'S11_(\d+)\.csv',
-        'AR': r'AR_(\d+)\.csv',
-        'Gain': r'Gain_(\d+)\.csv'
-    }
-    
     iterations = set()
     
-    for data_type, pattern in data_patterns.items():
-        regex = re.compile(pattern)
-        for file in Path(data_path).glob("*.csv"):
-            match = regex.match(file.name)
-            if match:
-                iteration = int(match.group(1))
-                if iteration > start_iteration:
-                    iterations.add(iteration)
+    # One directory pass classifies every data type at once
+    try:
+        with os.scandir(data_path) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.csv'):
+                    continue
+                match = _ITERATION_CSV_RE.match(entry.name)
+                if match:
+                    iteration = int(match.group(2))
+                    if iteration > start_iteration:
+                        iterations.add(iteration)
+    except OSError:
+        # Unreadable or missing directory - no iterations, as glob would report
+        pass
     
-    return sorted(list(iterations))
+    return sorted(iterations)
 
-def read_csv_standardized(filepath):
-    """Read CSV and return standardized DataFrame."""
+def _is_candidate_column(name):
+    """usecols filter keeping only columns that could be the frequency or value column."""
+    name = name.lower()
+    return 'freq' in name or any(kw in name for kw in VALUE_KEYWORDS)
+
+def _read_float_columns(filepath, columns):
+    """Parse just the given columns as float64 - with pyarrow when installed, else the C engine."""
+    if pa_csv is not None:
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=list(columns),
+            column_types={col: pa.float64() for col in columns}
+        )
+        df = arrow_read_csv(filepath, convert_options).to_pandas()
+    else:
+        df = pd.read_csv(filepath, usecols=list(columns), dtype=np.float64, engine='c')
+    return df[list(columns)].set_axis(['Frequency_GHz', 'Value'], axis=1)
+
+def _read_csv_frame(filepath):
+    """Read CSV into a standardized DataFrame, returning (df or None, error message or None)."""
+    # Plain numeric exports skip type inference; anything the typed read rejects
+    # goes through the general read below
+    columns = detect_columns(filepath)
+    if columns is not None:
+        try:
+            return _read_float_columns(filepath, columns), None
+        except Exception:
+            pass
+    
     try:
-        df = pd.read_csv(filepath)
+        # Columns that can never be picked below are not parsed at all
+        df = pd.read_csv(filepath, usecols=_is_candidate_column)
         
         # Find frequency and value columns
-        freq_col = None
-        value_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'freq' in col_lower:
-                freq_col = col
-            elif any(kw in col_lower for kw in ['s(1,1)', 's11', 'ar', 'gain', 'db(']):
-                value_col = col
+        freq_col, value_col = find_columns(df.columns)
         
         if freq_col and value_col:
             return df[[freq_col, value_col]].rename(columns={
                 freq_col: 'Frequency_GHz',
                 value_col: 'Value'
-            })
+            }), None
     except Exception as e:
-        print(f"[ERROR] Reading {filepath}: {e}")
+        return None, f"[ERROR] Reading {filepath}: {e}"
     
-    return None
+    return None, None
+
+def read_csv_standardized(filepath):
+    """Read CSV and return standardized DataFrame."""
+    df, message = _read_csv_frame(filepath)
+    if message:
+        print(message)
+    return df
+
+def _open_read_pool(iteration_count):
+    """Start the pool that reads a catch-up's CSVs ahead, or return None for small catch-ups."""
+    if iteration_count < _PARALLEL_READ_MIN_ITERATIONS:
+        return None
+    workers = os.cpu_count() or 1
+    if iteration_count >= _PARALLEL_PARSE_MIN_ITERATIONS and workers >= 2:
+        try:
+            return ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            pass
+    return ThreadPoolExecutor(max_workers=_CSV_READ_WORKERS)
 
-def append_iteration_to_excel(wb, data_path, iteration):
-    """Append a single iteration's data to an already-opened workbook."""
-    data_configs = {
-        'S11': {'pattern': f'S11_{iteration}.csv', 'sheet': 'S11_Data', 'col': 'S11_dB'},
-        'AR': {'pattern': f'AR_{iteration}.csv', 'sheet': 'AR_Data', 'col': 'AR'},
-        'Gain': {'pattern': f'Gain_{iteration}.csv', 'sheet': 'Gain_Data', 'col': 'Gain_dBi'}
-    }
+def _submit_csv_reads(pool, data_path, iterations):
+    """Start reading every existing CSV of the given iterations, keyed by (iteration, data type)."""
+    futures = {}
+    for iteration in iterations:
+        for data_type, config in DATA_CONFIGS.items():
+            csv_file = Path(data_path) / config['pattern'].format(iteration=iteration)
+            if csv_file.exists():
+                futures[(iteration, data_type)] = pool.submit(_read_csv_frame, csv_file)
+    return futures
+
+class XlsxRewriteSheet:
+    """Append-only worksheet over an xlsxwriter worksheet."""
     
-    for data_type, config in data_configs.items():
-        csv_file = Path(data_path) / config['pattern']
-        
-        if not csv_file.exists():
-            continue
-        
-        df = read_csv_standardized(csv_file)
+    def __init__(self, worksheet):
+        self._worksheet = worksheet
+        self._worksheet.add_write_handler(float, write_finite)
+        self._next_row = 0
+    
+    def append(self, row):
+        """Write one row of values below the previous one."""
+        self._worksheet.write_row(self._next_row, 0, row)
+        self._next_row += 1
+
+class XlsxRewriteWorkbook:
+    """The part of the openpyxl workbook API used here, written through xlsxwriter.
+    
+    Worksheets are streamed in constant_memory mode, so rows can only be appended.
+    The file is written to output_path by save(); an unsaved workbook is discarded.
+    """
+    
+    def __init__(self, output_path):
+        self._workbook = xlsxwriter.Workbook(str(output_path), {
+            'constant_memory': True,
+            'strings_to_numbers': False
+        })
+        self._sheets = {}
+    
+    @property
+    def sheetnames(self):
+        return list(self._sheets)
+    
+    def __getitem__(self, title):
+        return self._sheets[title]
+    
+    def create_sheet(self, title):
+        ws = self._sheets[title] = XlsxRewriteSheet(self._workbook.add_worksheet(title))
+        return ws
+    
+    def save(self, output_path):
+        self._workbook.close()
+    
+    def close(self):
+        pass
+
+def load_workbook_for_rewrite(excel_path, output_path):
+    """Copy a workbook's sheet values into a new streaming workbook, ready for appending.
+    
+    Reads the source in read-only mode, so neither workbook holds more than a row
+    of cell objects at a time. Values are kept; styles and other sheet metadata are not.
+    Writes through xlsxwriter when installed, otherwise an openpyxl write-only workbook.
+    """
+    source = load_workbook(excel_path, read_only=True)
+    wb = XlsxRewriteWorkbook(output_path) if xlsxwriter is not None else Workbook(write_only=True)
+    try:
+        for source_ws in source.worksheets:
+            # Stored dimensions can be wrong - read every row that is actually there
+            source_ws.reset_dimensions()
+            ws = wb.create_sheet(source_ws.title)
+            for row in source_ws.iter_rows(values_only=True):
+                ws.append(row)
+    finally:
+        source.close()
+    return wb
+
+class PendingRows:
+    """Workbook stand-in that only collects the rows appended to each sheet.
+    
+    Sheets are plain lists of row tuples; created lists the sheets that did
+    not exist yet, in creation order.
+    """
+    
+    def __init__(self, sheetnames):
+        self.sheetnames = list(sheetnames)
+        self.rows = {}
+        self.created = []
+    
+    def __getitem__(self, title):
+        return self.rows.setdefault(title, [])
+    
+    def create_sheet(self, title):
+        self.sheetnames.append(title)
+        self.created.append(title)
+        return self[title]
+
+def append_iteration_to_excel(wb, data_path, iteration, reads=None):
+    """Append a single iteration's data to an already-opened workbook (or PendingRows).
+    
+    reads optionally holds CSV reads already started by _submit_csv_reads.
+    """
+    appended = False
+    for data_type, config in DATA_CONFIGS.items():
+        if reads is not None:
+            future = reads.get((iteration, data_type))
+            if future is None:
+                continue
+            df, message = future.result()
+            if message:
+                print(message)
+        else:
+            csv_file = Path(data_path) / config['pattern'].format(iteration=iteration)
+            
+            if not csv_file.exists():
+                continue
+            
+            df = read_csv_standardized(csv_file)
         if df is None:
             continue
         
-        # Add iteration column
-        df['Iteration'] = iteration
-        df = df.rename(columns={'Value': config['col']})
-        df = df[['Iteration', 'Frequency_GHz', config['col']]]
-        
         # Get or create sheet
         if config['sheet'] not in wb.sheetnames:
             ws = wb.create_sheet(config['sheet'])
@@ -108,9 +377,48 @@ def append_iteration_to_excel(wb, data_path, iteration):
         else:
             ws = wb[config['sheet']]
         
-        # Append rows
-        for _, row in df.iterrows():
-            ws.append([row['Iteration'], row['Frequency_GHz'], row[config['col']]])
+        # Rows are built straight from the two columns as plain Python values,
+        # with the iteration number prepended
+        for row in zip(repeat(iteration), df['Frequency_GHz'].tolist(), df['Value'].tolist()):
+            ws.append(row)
+        if len(df):
+            appended = True
+    
+    return appended
+
+def collect_iteration_rows(wb, data_path, iterations):
+    """Append every given iteration to wb (usually PendingRows), reporting progress.
+    
+    Returns the last iteration that added rows (0 if none), or None after a failure.
+    """
+    last_iteration = 0
+    pool = None
+    reads = None
+    try:
+        # Larger catch-ups read all their CSVs ahead on a thread or process pool;
+        # results are still consumed (and reported) in iteration order
+        pool = _open_read_pool(len(iterations))
+        if pool is not None:
+            reads = _submit_csv_reads(pool, data_path, iterations)
+        
+        for i, iteration in enumerate(iterations, 1):
+            try:
+                print(f"   [{i}/{len(iterations)}] Adding iteration {iteration}...", end=" ")
+                if append_iteration_to_excel(wb, data_path, iteration, reads):
+                    last_iteration = iteration
+                print("[OK]")
+            except Exception as e:
+                print(f"[ERROR] {e}")
+                return None
+    finally:
+        if pool is not None:
+            # Reads still queued after a failure are dropped (shutdown's
+            # cancel_futures needs Python 3.9)
+            for future in (reads or {}).values():
+                future.cancel()
+            pool.shutdown()
+    
+    return last_iteration
 
 def update_excel_incremental(project_path):
     """Main update function - finds and appends all missing iterations."""
@@ -122,8 +430,13 @@ def update_excel_incremental(project_path):
         print(f"[ERROR] Data path not found: {data_path}")
         return False
     
-    # Get current state
-    last_excel_iter = get_last_iteration_in_excel(excel_path)
+    # Get current state - from the sidecar when it matches the workbook, otherwise
+    # by scanning the workbook once (and recording the result for next time)
+    last_excel_iter = read_iteration_state(excel_path)
+    if last_excel_iter is None:
+        last_excel_iter = get_last_iteration_in_excel(excel_path)
+        if excel_path.exists():
+            write_iteration_state(excel_path, last_excel_iter)
     print(f"Excel has iterations up to: {last_excel_iter}")
     
     # Find missing iterations
@@ -135,28 +448,55 @@ def update_excel_incremental(project_path):
     
     print(f"Found {len(missing_iterations)} missing iterations: {missing_iterations[0]}-{missing_iterations[-1]}")
     
-    # Open Excel once, add all iterations, save once
+    # Collect every missing iteration's rows first, then write them in one pass.
+    # Only the sheet names are read from the workbook up front
+    tmp_path = excel_path.with_name(excel_path.name + '.tmp')
     wb = None
     try:
-        wb = load_workbook(excel_path)
+        with zipfile.ZipFile(excel_path) as archive:
+            pending = PendingRows(sheet_parts(archive))
         
-        # Append each iteration to the open workbook
-        for i, iteration in enumerate(missing_iterations, 1):
-            try:
-                print(f"   [{i}/{len(missing_iterations)}] Adding iteration {iteration}...", end=" ")
-                append_iteration_to_excel(wb, data_path, iteration)
-                print("[OK]")
-            except Exception as e:
-                print(f"[ERROR] {e}")
-                return False
+        # Append each iteration to the pending rows
+        last_added = collect_iteration_rows(pending, data_path, missing_iterations)
+        if last_added is None:
+            return False
+        last_excel_iter = max(last_excel_iter, last_added)
         
         # Save once at the end
         print("Saving Excel file...", end=" ")
-        wb.save(excel_path)
+        if not any(pending.rows.values()):
+            # None of the files could be read - the workbook is left untouched
+            pass
+        elif not pending.created and append_sheet_rows(
+                excel_path, tmp_path, {title: (None, rows) for title, rows in pending.rows.items()}):
+            # Rows went straight into the existing sheet XML
+            os.replace(tmp_path, excel_path)
+        else:
+            # New sheets are needed - go through a workbook. A large catch-up streams
+            # the existing rows into a new workbook rather than loading every cell
+            bulk_rewrite = len(missing_iterations) > BULK_REWRITE_MIN_ITERATIONS
+            if bulk_rewrite:
+                wb = load_workbook_for_rewrite(excel_path, tmp_path)
+            else:
+                wb = load_workbook(excel_path)
+            for title, rows in pending.rows.items():
+                ws = wb.create_sheet(title) if title in pending.created else wb[title]
+                for row in rows:
+                    ws.append(row)
+            
+            if bulk_rewrite:
+                # A streaming workbook can only be saved once - swap it in when complete
+                wb.save(tmp_path)
+                os.replace(tmp_path, excel_path)
+            else:
+                wb.save(excel_path)
         print("[OK]")
+        write_iteration_state(excel_path, last_excel_iter)
         
     except Exception as e:
         print(f"[ERROR] Failed to update Excel: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
         return False
     finally:
         if wb:
@@ -165,10 +505,182 @@ def update_excel_incremental(project_path):
     print(f"Excel updated successfully! Now has {missing_iterations[-1]} iterations.")
     return True
 
+def get_last_iteration_in_parquet(parquet_path):
+    """Get the last iteration committed to the Parquet dataset (0 if there is none, None if unreadable)."""
+    try:
+        with open(Path(parquet_path) / PARQUET_STATE_NAME, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read Parquet dataset state: {e}")
+        return None
+    
+    last_iteration = state.get('last_iteration') if isinstance(state, dict) else None
+    if not isinstance(last_iteration, int):
+        print("[ERROR] Could not read Parquet dataset state: no last iteration recorded")
+        return None
+    return last_iteration
+
+def write_parquet_state(parquet_path, last_iteration):
+    """Commit last_iteration as the dataset's last complete iteration, replacing the state atomically."""
+    state_path = Path(parquet_path) / PARQUET_STATE_NAME
+    tmp_path = state_path.with_name(state_path.name + '.tmp')
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'last_iteration': last_iteration}, f)
+    os.replace(tmp_path, state_path)
+
+def _discard_uncommitted_files(parquet_path, last_iteration):
+    """Delete dataset files left by an update that failed before committing its state."""
+    for partition in Path(parquet_path).glob('data_type=*'):
+        with os.scandir(partition) as entries:
+            for entry in entries:
+                match = _PARQUET_FILE_RE.fullmatch(entry.name)
+                if match and int(match.group(1)) > last_iteration:
+                    os.unlink(entry.path)
+
+def append_rows_to_parquet(parquet_path, pending, first_iteration, last_iteration):
+    """Write the rows collected in pending as new files of the Parquet dataset."""
+    tables = []
+    for data_type, config in DATA_CONFIGS.items():
+        rows = pending.rows.get(config['sheet'])
+        if not rows:
+            continue
+        iterations, frequencies, values = zip(*rows)
+        tables.append(pa.table({
+            'Iteration': pa.array(iterations, pa.int64()),
+            'Frequency_GHz': pa.array(frequencies, pa.float64()),
+            'Value': pa.array(values, pa.float64()),
+            'data_type': pa.array([data_type] * len(rows), pa.string())
+        }))
+    if not tables:
+        return
+    
+    pq.write_to_dataset(
+        pa.concat_tables(tables), parquet_path,
+        partition_cols=['data_type'],
+        basename_template=f'iterations-{first_iteration}-{last_iteration}-{{i}}.parquet',
+        existing_data_behavior='overwrite_or_ignore'
+    )
+
+def update_parquet_incremental(project_path):
+    """Append all missing iterations to the Parquet dataset, leaving the workbook untouched."""
+    project_path = Path(project_path)
+    parquet_path = project_path / PARQUET_DIR_NAME
+    data_path = project_path / "Optimization" / "data"
+    
+    if pq is None:
+        print("[ERROR] pyarrow is required for the Parquet store")
+        return False
+    if not data_path.exists():
+        print(f"[ERROR] Data path not found: {data_path}")
+        return False
+    
+    last_parquet_iter = get_last_iteration_in_parquet(parquet_path)
+    if last_parquet_iter is None:
+        return False
+    print(f"Parquet has iterations up to: {last_parquet_iter}")
+    
+    missing_iterations = find_csv_iterations(data_path, last_parquet_iter)
+    if not missing_iterations:
+        print("Parquet store is up to date!")
+        return True
+    
+    print(f"Found {len(missing_iterations)} missing iterations: {missing_iterations[0]}-{missing_iterations[-1]}")
+    
+    # Every data type counts as an existing "sheet", so no header rows are collected
+    pending = PendingRows(config['sheet'] for config in DATA_CONFIGS.values())
+    last_added = collect_iteration_rows(pending, data_path, missing_iterations)
+    if last_added is None:
+        return False
+    
+    try:
+        print("Saving Parquet dataset...", end=" ")
+        # Files of an update that died part-way (some partitions written, state not
+        # committed) are dropped first, so a retry writes every data type again
+        if parquet_path.exists():
+            _discard_uncommitted_files(parquet_path, last_parquet_iter)
+        append_rows_to_parquet(parquet_path, pending, missing_iterations[0], missing_iterations[-1])
+        write_parquet_state(parquet_path, max(last_parquet_iter, last_added))
+        print("[OK]")
+    except Exception as e:
+        print(f"[ERROR] Failed to update Parquet dataset: {e}")
+        return False
+    
+    print(f"Parquet updated successfully! Now has {missing_iterations[-1]} iterations.")
+    return True
+
+def regenerate_excel(project_path):
+    """Rebuild Integrated_Results.xlsx from the Parquet dataset in one streaming write."""
+    project_path = Path(project_path)
+    excel_path = project_path / "Integrated_Results.xlsx"
+    parquet_path = project_path / PARQUET_DIR_NAME
+    
+    if pq is None:
+        print("[ERROR] pyarrow is required for the Parquet store")
+        return False
+    if not parquet_path.exists():
+        print(f"[ERROR] Parquet dataset not found: {parquet_path}")
+        return False
+    committed_iter = get_last_iteration_in_parquet(parquet_path)
+    if committed_iter is None:
+        return False
+    
+    tmp_path = excel_path.with_name(excel_path.name + '.tmp')
+    wb = None
+    try:
+        wb = XlsxRewriteWorkbook(tmp_path) if xlsxwriter is not None else Workbook(write_only=True)
+        last_iteration = 0
+        for data_type, config in DATA_CONFIGS.items():
+            df = pd.read_parquet(
+                parquet_path,
+                columns=['Iteration', 'Frequency_GHz', 'Value'],
+                # Rows of an update that has not committed yet are left out
+                filters=[('data_type', '=', data_type), ('Iteration', '<=', committed_iter)]
+            )
+            # Dataset files are not in iteration order; rows within an iteration are
+            df = df.sort_values('Iteration', kind='stable')
+            
+            ws = wb.create_sheet(config['sheet'])
+            ws.append(['Iteration', 'Frequency_GHz', config['col']])
+            for row in df.itertuples(index=False, name=None):
+                ws.append(row)
+            if len(df):
+                last_iteration = max(last_iteration, int(df['Iteration'].iloc[-1]))
+            print(f"   Wrote {len(df)} rows to sheet '{config['sheet']}'")
+        
+        wb.save(tmp_path)
+        os.replace(tmp_path, excel_path)
+        write_iteration_state(excel_path, last_iteration)
+    except Exception as e:
+        print(f"[ERROR] Failed to regenerate Excel: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return False
+    finally:
+        if wb:
+            wb.close()
+    
+    print(f"Excel regenerated successfully! Now has {last_iteration} iterations.")
+    return True
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Update Excel with missing iterations")
     parser.add_argument("--project-path", required=True, help="Path to project folder")
+    parser.add_argument("--store", choices=["excel", "parquet"], default="excel",
+                        help="Append missing iterations to the workbook (default) or only to the Parquet dataset")
+    parser.add_argument("--regenerate-excel", action="store_true",
+                        help="Rebuild the workbook from the Parquet dataset after updating it (requires --store parquet)")
     args = parser.parse_args()
+    if args.regenerate_excel and args.store != "parquet":
+        # The workbook would be overwritten from a dataset that this run did not update
+        parser.error("--regenerate-excel requires --store parquet")
     
-    success = update_excel_incremental(args.project_path)
+    if args.store == "parquet":
+        success = update_parquet_incremental(args.project_path)
+    else:
+        success = update_excel_incremental(args.project_path)
+    if success and args.regenerate_excel:
+        success = regenerate_excel(args.project_path)
     sys.exit(0 if success else 1)
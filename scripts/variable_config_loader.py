@@ -4,9 +4,17 @@ Reads antenna variable definitions from external JSON configuration file.
 Used by backend scripts to dynamically load optimization parameters.
 """
 
+import copy
+import functools
 import json
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Default path to configuration file
 CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
@@ -22,22 +30,54 @@ class VariableConfig:
         """
         Initialize the variable configuration loader.
         
+        The file is read on first access to its contents, not here.
+        
         Args:
             config_path: Path to the JSON configuration file
         """
         self.config_path = config_path
-        self.config_data = None
-        self.variables = None
-        self.metadata = None
-        self._load_config()
+        self._config_data = None
+        self._variables = None
+        self._metadata = None
+        self._by_id = {}
+        self._by_name = {}
+        self._by_category = {}
+        self._optimization_vars = ()
+        self._ground_plane_vars = ()
+        self._loaded = False
+    
+    @property
+    def config_data(self) -> Dict[str, Any]:
+        """Parsed configuration file."""
+        self._ensure_loaded()
+        return self._config_data
+    
+    @property
+    def variables(self) -> List[Dict[str, Any]]:
+        """Variable definitions from the configuration file."""
+        self._ensure_loaded()
+        return self._variables
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata section of the configuration file."""
+        self._ensure_loaded()
+        return self._metadata
+    
+    def _ensure_loaded(self):
+        """Load the configuration file if it has not been loaded yet."""
+        if not self._loaded:
+            self._load_config()
     
     def _load_config(self):
         """Load the configuration file and parse JSON data."""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config_data = json.load(f)
-                self.variables = self.config_data.get('variables', [])
-                self.metadata = self.config_data.get('metadata', {})
+            with open(self.config_path, 'rb') as f:
+                self._config_data = _json_loads(f.read())
+                self._variables = self._config_data.get('variables', [])
+                self._metadata = self._config_data.get('metadata', {})
+                self._build_indexes()
+                self._loaded = True
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Configuration file not found: {self.config_path}\n"
@@ -46,6 +86,22 @@ class VariableConfig:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in configuration file: {e}")
     
+    def _build_indexes(self):
+        """
+        Index variables by ID and name (first definition wins, as a linear scan would)
+        and bucket them by category and custom flag, in configuration order.
+        """
+        self._by_id = {}
+        self._by_name = {}
+        by_category = {}
+        for var in self._variables:
+            self._by_id.setdefault(var.get('id'), var)
+            self._by_name.setdefault(var.get('name'), var)
+            by_category.setdefault(var.get('category'), []).append(var)
+        self._by_category = {category: tuple(group) for category, group in by_category.items()}
+        self._optimization_vars = tuple(var for var in self._variables if not var.get('custom', False))
+        self._ground_plane_vars = tuple(var for var in self._variables if var.get('custom', False))
+    
     def get_all_variables(self) -> List[Dict[str, Any]]:
         """
         Get all variable definitions.
@@ -65,10 +121,8 @@ class VariableConfig:
         Returns:
             Variable dictionary or None if not found
         """
-        for var in self.variables:
-            if var.get('id') == var_id:
-                return var
-        return None
+        self._ensure_loaded()
+        return self._by_id.get(var_id)
     
     def get_variable_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -80,12 +134,10 @@ class VariableConfig:
         Returns:
             Variable dictionary or None if not found
         """
-        for var in self.variables:
-            if var.get('name') == name:
-                return var
-        return None
+        self._ensure_loaded()
+        return self._by_name.get(name)
     
-    def get_variables_by_category(self, category: str) -> List[Dict[str, Any]]:
+    def get_variables_by_category(self, category: str) -> Tuple[Dict[str, Any], ...]:
         """
         Get all variables in a specific category.
         
@@ -93,9 +145,10 @@ class VariableConfig:
             category: Category name (e.g., 'standard', 'special', 'ground_plane')
             
         Returns:
-            List of variables in the specified category
+            Tuple of variables in the specified category
         """
-        return [var for var in self.variables if var.get('category') == category]
+        self._ensure_loaded()
+        return self._by_category.get(category, ())
     
     def get_selected_variables(self, selected_ids: List[int]) -> List[Dict[str, Any]]:
         """
@@ -107,7 +160,8 @@ class VariableConfig:
         Returns:
             List of matching variable dictionaries
         """
-        return [var for var in self.variables if var.get('id') in selected_ids]
+        selected = set(selected_ids)
+        return [var for var in self.variables if var.get('id') in selected]
     
     def get_variable_definitions_dict(self) -> Dict[int, Dict[str, Any]]:
         """
@@ -118,23 +172,25 @@ class VariableConfig:
         """
         return {var['id']: var for var in self.variables}
     
-    def get_optimization_variables(self) -> List[Dict[str, Any]]:
+    def get_optimization_variables(self) -> Tuple[Dict[str, Any], ...]:
         """
         Get all non-custom variables (variables 1-82 for optimization).
         
         Returns:
-            List of optimization variables (excludes ground plane custom variables)
+            Tuple of optimization variables (excludes ground plane custom variables)
         """
-        return [var for var in self.variables if not var.get('custom', False)]
+        self._ensure_loaded()
+        return self._optimization_vars
     
-    def get_ground_plane_variables(self) -> List[Dict[str, Any]]:
+    def get_ground_plane_variables(self) -> Tuple[Dict[str, Any], ...]:
         """
         Get ground plane configuration variables (83-86).
         
         Returns:
-            List of ground plane variables
+            Tuple of ground plane variables
         """
-        return [var for var in self.variables if var.get('custom', False)]
+        self._ensure_loaded()
+        return self._ground_plane_vars
     
     def validate_variable(self, var: Dict[str, Any]) -> bool:
         """
@@ -160,9 +216,32 @@ class VariableConfig:
     
     def reload(self):
         """Reload the configuration from file."""
+        _get_config.cache_clear()
         self._load_config()
 
 
+@functools.lru_cache(maxsize=8)
+def _get_config(config_path: str, source_key: Tuple[int, int]) -> VariableConfig:
+    """
+    Shared VariableConfig for one version of a configuration file.
+    
+    Args:
+        config_path: Path to configuration file
+        source_key: (mtime_ns, size) of the file, so an edited file is parsed again
+    """
+    return VariableConfig(config_path)
+
+
+def _shared_config(config_path: str = DEFAULT_CONFIG_PATH) -> VariableConfig:
+    """Return the cached VariableConfig for config_path, parsing the file only when it changed."""
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        # Let VariableConfig report the missing file as usual
+        return VariableConfig(config_path)
+    return _get_config(config_path, (st.st_mtime_ns, st.st_size))
+
+
 # Convenience function for quick access
 def load_variables(config_path: str = DEFAULT_CONFIG_PATH) -> List[Dict[str, Any]]:
     """
@@ -174,8 +253,8 @@ def load_variables(config_path: str = DEFAULT_CONFIG_PATH) -> List[Dict[str, Any
     Returns:
         List of all variable dictionaries
     """
-    config = VariableConfig(config_path)
-    return config.get_all_variables()
+    # Deep copy - callers get their own dicts, as when every call parsed the file
+    return copy.deepcopy(_shared_config(config_path).get_all_variables())
 
 
 def load_variable_definitions() -> Dict[int, Dict[str, Any]]:
@@ -185,8 +264,8 @@ def load_variable_definitions() -> Dict[int, Dict[str, Any]]:
     Returns:
         Dictionary with variable IDs as keys
     """
-    config = VariableConfig()
-    return config.get_variable_definitions_dict()
+    # Deep copy - callers get their own dicts, as when every call parsed the file
+    return copy.deepcopy(_shared_config().get_variable_definitions_dict())
 
 
 if __name__ == '__main__':